@@ -0,0 +1,145 @@
+"""Compara a decodificação completa com a decodificação reduzida das miniaturas.
+
+Gera imagens JPEG/PNG/GIF de vários tamanhos numa pasta temporária e mede,
+para cada uma, o tempo e o pico de memória da decodificação:
+  - completa: QImage(arquivo) em resolução cheia e depois scaled() (comportamento antigo);
+  - reduzida: QImageReader com setScaledSize (gui.thumbnail_loader).
+
+O pico é medido do mesmo jeito nos dois lados: cada decodificação roda num
+processo novo, e o valor é quanto o pico de memória residente (RSS) do
+processo cresceu durante ela.
+
+Uso: python benchmarks/image_thumbnail_decode.py [repetições]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QCoreApplication, Qt
+from PySide6.QtGui import QImage, QImageReader, QColor, QPainter, QLinearGradient
+
+from gui.thumbnail_loader import THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT, _load_image_thumbnail
+
+SAMPLES = [
+    ("jpg", 1920, 1080),
+    ("jpg", 4000, 3000),
+    ("jpg", 8660, 5773),  # ~50 MP
+    ("png", 1920, 1080),
+    ("png", 4000, 3000),
+    ("gif", 800, 600),
+    ("gif", 2000, 1500),
+]
+
+
+def create_sample(folder, extension, width, height):
+    path = os.path.join(folder, f"sample_{width}x{height}.{extension}")
+    if extension == "gif":
+        # O Qt só lê GIF; para gravar usamos o Pillow (já nas dependências)
+        from PIL import Image
+        Image.linear_gradient("L").resize((width, height)).convert("P").save(path)
+        return path
+
+    image = QImage(width, height, QImage.Format_RGB32)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, QColor(20, 60, 200))
+    gradient.setColorAt(1, QColor(240, 180, 30))
+    painter = QPainter(image)
+    painter.fillRect(image.rect(), gradient)
+    painter.end()
+    image.save(path)
+    return path
+
+
+def full_decode(path):
+    image = QImage(path)
+    return image.scaled(THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+def reduced_decode(path):
+    return _load_image_thumbnail(path)
+
+
+DECODERS = {"full": full_decode, "reduced": reduced_decode}
+
+
+def peak_rss_bytes():
+    """Pico de memória residente do processo até agora."""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(),
+                                                 ctypes.byref(counters), counters.cb)
+        return counters.PeakWorkingSetSize
+    if sys.platform.startswith("linux"):
+        # ru_maxrss herda o pico do processo pai no fork/exec; VmHWM é só deste processo
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS informa em bytes, os demais em KiB
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure_peak(decoder, path):
+    """Roda a decodificação num processo novo e retorna quanto o pico de RSS cresceu."""
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--peak", decoder, path],
+                            check=True, capture_output=True, text=True).stdout
+    return int(output.split()[-1])
+
+
+def print_peak(decoder, path):
+    """Executado no processo filho de `measure_peak`."""
+    app = QCoreApplication(sys.argv)
+    # Carrega o plugin do formato antes da linha de base, lendo só o cabeçalho
+    QImageReader(path).size()
+    baseline = peak_rss_bytes()
+    image = DECODERS[decoder](path)
+    print(peak_rss_bytes() - baseline)
+    del image, app
+
+
+def timed(function, path, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(path)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    if sys.argv[1:2] == ["--peak"]:
+        print_peak(sys.argv[2], sys.argv[3])
+        return
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    app = QCoreApplication(sys.argv)  # carrega os plugins de imagem
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"{'arquivo':<24} {'completa':>22} {'reduzida':>22}")
+        for extension, width, height in SAMPLES:
+            path = create_sample(folder, extension, width, height)
+            full_ms = timed(full_decode, path, repeat)
+            reduced_ms = timed(reduced_decode, path, repeat)
+            full_peak = measure_peak("full", path)
+            reduced_peak = measure_peak("reduced", path)
+            print(f"{os.path.basename(path):<24} "
+                  f"{full_ms:7.1f} ms {full_peak / 1024:8.0f} KiB "
+                  f"{reduced_ms:7.1f} ms {reduced_peak / 1024:8.0f} KiB")
+    del app
+
+
+if __name__ == "__main__":
+    main()
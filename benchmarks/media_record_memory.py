@@ -0,0 +1,72 @@
+"""Mede a memória por registro de mídia em bibliotecas grandes.
+
+Compara as tuplas cruas do sqlite3, uma classe comum (com __dict__) e o
+MediaRecord com __slots__, montando 100k registros a partir de um banco em memória.
+
+Uso: python benchmarks/media_record_memory.py [quantidade]
+"""
+import os
+import sqlite3
+import sys
+import tracemalloc
+from itertools import starmap
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.database import MEDIA_COLUMNS
+from utils.media_record import MediaRecord
+
+
+class DictMediaRecord:
+    """Mesmos campos do MediaRecord, mas sem __slots__ (referência de comparação)."""
+
+    def __init__(self, *values):
+        for name, value in zip(MediaRecord.__slots__, values):
+            setattr(self, name, value)
+
+
+def build_database(count):
+    conn = sqlite3.connect(":memory:")
+    conn.execute(f"CREATE TABLE medias ({MEDIA_COLUMNS})")
+    placeholders = ", ".join("?" * len(MediaRecord.__slots__))
+    conn.executemany(
+        f"INSERT INTO medias ({MEDIA_COLUMNS}) VALUES ({placeholders})",
+        (
+            (i, f"media_{i}.jpg", "Imagem", f"/home/user/medias/media_{i}.jpg", 5,
+             "01/01/2025", "08:00", "31/12/2025", "18:00", 1735729200 + i, 1767211200 + i,
+             1920, 1080, None, None, None, 2_500_000 + i, 1735729200_000_000_000 + i, None)
+            for i in range(count)
+        ),
+    )
+    return conn
+
+
+def measure(label, conn, record_class, count):
+    """Lê a tabela como DatabaseManager._fetch_medias: fetchall() e um construtor posicional."""
+    cursor = conn.cursor()
+    tracemalloc.start()
+    rows = cursor.execute(f"SELECT {MEDIA_COLUMNS} FROM medias").fetchall()
+    if record_class is not None:
+        rows = list(starmap(record_class, rows))
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Só o contêiner (sem os valores, que são os mesmos nas três formas)
+    container = sys.getsizeof(rows[0])
+    if hasattr(rows[0], "__dict__"):
+        container += sys.getsizeof(rows[0].__dict__)
+    print(f"{label:<20} {current / 1024 / 1024:8.1f} MiB  {current / count:7.0f} bytes/registro"
+          f"  ({container} bytes de estrutura)")
+    del rows
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    conn = build_database(count)
+    print(f"{count} registros")
+    measure("tupla (sqlite3)", conn, None, count)
+    measure("classe com __dict__", conn, DictMediaRecord, count)
+    measure("MediaRecord", conn, MediaRecord, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+from PySide6.QtWidgets import QWidget, QSizePolicy
+from PySide6.QtGui import QPainter, QPixmap
+from PySide6.QtCore import Qt, QRect
+
+
+class DisplayCanvas(QWidget):
+    """Superfície onde o player pinta as imagens.
+
+    A imagem chega já escalada para o tamanho de exibição (ver
+    `load_display_image`) e é desenhada 1:1 no `paintEvent`, centralizada com
+    faixas pretas ao redor. A posição é calculada uma vez por imagem (ou por
+    redimensionamento), e trocar de imagem só agenda uma repintura: não há
+    nova escala nem passagem de layout na transição.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pixmap = QPixmap()
+        self.target_rect = QRect()
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        # O paintEvent pinta toda a área (imagem + faixas): o Qt não precisa limpar o fundo
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+    def set_image(self, image):
+        """Exibe o QImage pronto (com o devicePixelRatio já ajustado)."""
+        self.pixmap = QPixmap.fromImage(image)
+        self.update_target_rect()
+        self.update()
+
+    def clear(self):
+        self.pixmap = QPixmap()
+        self.target_rect = QRect()
+        self.update()
+
+    def update_target_rect(self):
+        if self.pixmap.isNull():
+            self.target_rect = QRect()
+            return
+        target_rect = QRect(0, 0, 0, 0)
+        target_rect.setSize(self.pixmap.deviceIndependentSize().toSize())
+        target_rect.moveCenter(self.rect().center())
+        self.target_rect = target_rect
+
+    def resizeEvent(self, event):
+        self.update_target_rect()
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), Qt.black)
+        if not self.pixmap.isNull():
+            painter.drawPixmap(self.target_rect, self.pixmap)
+        painter.end()
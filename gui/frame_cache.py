@@ -0,0 +1,56 @@
+from utils.memory_cache import MemoryCache
+
+# Orçamento padrão dos quadros prontos em memória (um quadro 1920x1080 RGB32 ocupa ~8 MB)
+DEFAULT_FRAME_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def image_bytes(image):
+    if image is None or image.isNull():
+        return 0
+    return image.sizeInBytes()
+
+
+class FrameCache(MemoryCache):
+    """Cache, com limite em bytes, dos QImages já prontos para exibição.
+
+    As chaves vêm de `frame_key()` (arquivo, tamanho, modo e devicePixelRatio),
+    então mudar de tela ou de modo simplesmente gera chaves novas. Ao passar do
+    limite, saem primeiro os quadros fora da programação (do menos usado ao mais
+    usado) e depois os que só voltam à tela mais tarde, segundo a ordem passada
+    a `set_playlist()`: num loop que cabe no orçamento nada é decodificado de
+    novo, e num que não cabe ficam os quadros que serão usados antes.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_FRAME_CACHE_BYTES):
+        super().__init__(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._playlist = {}  # chave -> posição na ordem de exibição (0 = atual)
+
+    def get(self, key):
+        """Retorna o quadro da chave (ou None), contando acerto ou falha."""
+        image = super().get(key)
+        if image is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return image
+
+    def clear(self):
+        super().clear()
+        self._playlist = {}
+
+    def set_playlist(self, keys):
+        """Informa a ordem em que os quadros serão exibidos, a partir do atual."""
+        self._playlist = {}
+        for position, key in enumerate(keys):
+            self._playlist.setdefault(key, position)
+        self._evict()
+
+    def value_bytes(self, image):
+        return image_bytes(image)
+
+    def eviction_order(self):
+        far_away = len(self._playlist)
+        # sort é estável: entre os de fora da programação vale a ordem LRU
+        return sorted(self._entries, key=lambda key: self._playlist.get(key, far_away), reverse=True)
@@ -0,0 +1,115 @@
+import threading
+from PySide6.QtCore import QObject, QThreadPool, QSize, Qt, Signal
+from PySide6.QtGui import QImage, QImageIOHandler, QImageReader
+
+
+def display_target_size(source_size, screen_size, display_mode):
+    """Tamanho lógico em que a imagem será exibida.
+
+    No "Fullscreen" a imagem estica até a tela (distorção proposital); no
+    "Original" mantém o tamanho real, reduzida para caber na tela se preciso.
+    """
+    if display_mode == "Fullscreen":
+        return QSize(screen_size)
+    if source_size.width() > screen_size.width() or source_size.height() > screen_size.height():
+        return source_size.scaled(screen_size, Qt.KeepAspectRatio)
+    return QSize(source_size)
+
+
+def frame_key(media, screen_size, display_mode, device_pixel_ratio):
+    """Chave do quadro pronto de `media` na tela e no modo informados.
+
+    O arquivo é identificado pelo caminho junto com o tamanho e o mtime gravados
+    na importação, então um arquivo alterado não reaproveita o quadro antigo.
+    """
+    return (media.file_path, media.file_size, media.file_mtime_ns,
+            screen_size.width(), screen_size.height(), display_mode, device_pixel_ratio)
+
+
+def load_display_image(file_path, screen_size, display_mode, device_pixel_ratio=1.0):
+    """Decodifica a imagem já no tamanho final de exibição (em pixels físicos).
+
+    O leitor recebe o tamanho de destino, então JPEGs grandes são reduzidos na
+    própria decodificação (escala DCT). Retorna um QImage pronto para pintar,
+    com o devicePixelRatio ajustado, ou None se o arquivo não puder ser lido.
+    Usa só QImage/QImageReader, então pode rodar fora da thread da interface.
+    """
+    reader = QImageReader(file_path)
+    reader.setAutoTransform(True)
+    source_size = reader.size()
+    if source_size.isValid():
+        # size() e setScaledSize() valem para a imagem antes da rotação do EXIF;
+        # o destino é calculado na orientação em que ela será exibida
+        rotated = bool(reader.transformation() & QImageIOHandler.TransformationRotate90)
+        display_size = source_size.transposed() if rotated else source_size
+        target_size = display_target_size(display_size, screen_size, display_mode) * device_pixel_ratio
+        if target_size != display_size:
+            reader.setScaledSize(target_size.transposed() if rotated else target_size)
+    image = reader.read()
+    if image.isNull():
+        return None
+    if not source_size.isValid():
+        # Formato sem tamanho no cabeçalho: escala depois de decodificar
+        target_size = display_target_size(image.size(), screen_size, display_mode) * device_pixel_ratio
+        if image.size() != target_size:
+            image = image.scaled(target_size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+    # Formato que o raster pinta sem conversão
+    if image.format() not in (QImage.Format_RGB32, QImage.Format_ARGB32_Premultiplied):
+        image = image.convertToFormat(
+            QImage.Format_ARGB32_Premultiplied if image.hasAlphaChannel() else QImage.Format_RGB32
+        )
+    image.setDevicePixelRatio(device_pixel_ratio)
+    return image
+
+
+class FramePrefetcher(QObject):
+    """Prepara numa thread de fundo a próxima imagem do player, já escalada.
+
+    `request()` começa a decodificar, a menos que o quadro já esteja no
+    FrameCache; pronto, o QImage é guardado no cache (na thread da interface),
+    onde o player o encontra na hora da transição.
+    """
+    frame_ready = Signal(object, object)  # (chave, QImage ou None)
+
+    def __init__(self, frame_cache, parent=None):
+        super().__init__(parent)
+        self.frame_cache = frame_cache
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        self._lock = threading.Lock()
+        self._pending = set()
+        self.frame_ready.connect(self._store_frame)
+
+    def request(self, media, screen_size, display_mode, device_pixel_ratio=1.0):
+        key = frame_key(media, screen_size, display_mode, device_pixel_ratio)
+        with self._lock:
+            if key in self.frame_cache or key in self._pending:
+                return key
+            self._pending.add(key)
+        file_path = media.file_path
+        screen_size = QSize(screen_size)
+        self.thread_pool.start(
+            lambda: self._load(key, file_path, screen_size, display_mode, device_pixel_ratio)
+        )
+        return key
+
+    def shutdown(self):
+        self.thread_pool.clear()
+        self.thread_pool.waitForDone()
+        with self._lock:
+            self._pending.clear()
+
+    def _load(self, key, file_path, screen_size, display_mode, device_pixel_ratio):
+        try:
+            image = load_display_image(file_path, screen_size, display_mode, device_pixel_ratio)
+        except Exception as e:
+            print(f"Erro ao pré-carregar {file_path}: {e}")
+            image = None
+        # Emitido da thread do pool: chega em _store_frame pela fila de eventos
+        self.frame_ready.emit(key, image)
+
+    def _store_frame(self, key, image):
+        with self._lock:
+            self._pending.discard(key)
+        if image is not None:
+            self.frame_cache.put(key, image)
@@ -0,0 +1,348 @@
+import os
+import queue
+import threading
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QImageReader
+from gui.thumbnail_loader import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS, generate_thumbnail
+from gui.video_probe import VideoProbe
+from utils.media_store import hash_file
+
+# Duração padrão (s) de exibição de imagens importadas
+DEFAULT_IMAGE_DURATION = 5
+# Itens em espera entre dois estágios: limita a memória e faz os estágios
+# rápidos esperarem os lentos em vez de acumular trabalho
+STAGE_QUEUE_SIZE = 16
+# Mídias por transação no estágio final e espera máxima para completar um lote
+INSERT_BATCH_SIZE = 50
+INSERT_BATCH_DELAY = 0.2
+# Intervalo (s) em que um estágio bloqueado numa fila cheia confere o cancelamento
+CANCEL_POLL_INTERVAL = 0.1
+
+_STOP = object()
+
+
+class ImportItem:
+    """Estado de um arquivo ao longo do pipeline de importação."""
+    __slots__ = ("index", "source_path", "name", "media_type", "duration_seconds",
+                 "content_hash", "stored_path", "created_file", "metadata")
+
+    def __init__(self, index, source_path):
+        self.index = index  # posição na seleção: as mídias são gravadas nessa ordem
+        self.source_path = source_path
+        self.name = os.path.basename(source_path)
+        self.media_type = None
+        self.duration_seconds = None
+        self.content_hash = None
+        self.stored_path = None
+        self.created_file = False  # True se o blob foi criado por esta importação
+        self.metadata = {}         # colunas de metadados de `medias` (largura, fps, ...)
+
+
+class _Stage:
+    """Um estágio do pipeline: `workers` threads lendo de uma fila limitada.
+
+    Quando a última thread do estágio termina, cada thread do estágio seguinte
+    recebe um _STOP, então o encerramento percorre o pipeline em ordem.
+    """
+
+    def __init__(self, pipeline, name, handler, workers):
+        self.pipeline = pipeline
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.input = queue.Queue(STAGE_QUEUE_SIZE)
+        self.next_stage = None
+        self._running = workers
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def start(self):
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"Import-{self.name}-{index}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def join(self):
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self):
+        while True:
+            item = self.input.get()
+            if item is _STOP:
+                break
+            if self.pipeline.is_cancelled():
+                self.pipeline._discard(item)
+                continue
+            try:
+                self.handler(item)
+            except Exception as e:
+                print(f"Erro ao importar {item.source_path} ({self.name}): {e}")
+                self.pipeline._discard(item)
+                self.pipeline._skip(item)
+                self.pipeline._item_done()
+                continue
+            self.pipeline._put(self.next_stage.input, item)
+        self.pipeline.repository.db_manager.close_thread_connection()
+
+        with self._lock:
+            self._running -= 1
+            is_last = self._running == 0
+        if is_last:
+            for _ in range(self.next_stage.workers):
+                self.next_stage.input.put(_STOP)
+
+
+class _InsertTarget:
+    """Adapta a fila da thread de gravação à interface de um estágio (input + workers)."""
+
+    def __init__(self, insert_queue):
+        self.input = insert_queue
+        self.workers = 1
+
+
+class ImportPipeline(QObject):
+    """Importa arquivos em estágios paralelos: metadados, hash, cópia, miniatura e gravação.
+
+    Cada estágio roda nas suas próprias threads, ligado ao seguinte por uma fila
+    limitada, então vários arquivos avançam ao mesmo tempo e a interface nunca
+    espera. Os arquivos vão para o MediaStore pelo hash do conteúdo: um conteúdo
+    já importado não é copiado nem tem a miniatura gerada de novo, só ganha mais
+    uma linha apontando para o mesmo blob. As mídias são gravadas em lotes pelo
+    repositório (que emite o delta de inserção), na ordem da seleção, mesmo que
+    os estágios terminem os arquivos fora de ordem. `cancel()` interrompe a
+    importação; os lotes já gravados são mantidos e os blobs criados e ainda não
+    gravados no banco são removidos.
+    """
+    progress = Signal(int, int)   # (arquivos concluídos, total)
+    finished = Signal(int, bool)  # (mídias importadas, cancelada)
+
+    def __init__(self, repository, media_store, thumbnail_cache=None, parent=None):
+        super().__init__(parent)
+        self.repository = repository
+        self.media_store = media_store
+        self.thumbnail_cache = thumbnail_cache
+
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._total = 0
+        self._done = 0
+        self._imported = 0
+        self._stored_paths = set()   # blobs já referenciados por mídias gravadas
+        self._orphan_paths = set()   # blobs criados e descartados antes de gravar
+        self._skipped_indexes = set()  # itens que falharam e nunca chegam à gravação
+
+        io_workers = 2
+        cpu_workers = max(1, (os.cpu_count() or 2) - 1)
+        self._stages = [
+            _Stage(self, "probe", self._probe, io_workers),
+            _Stage(self, "hash", self._hash, io_workers),
+            _Stage(self, "copy", self._copy, io_workers),
+            _Stage(self, "thumbnail", self._thumbnail, cpu_workers),
+        ]
+        for stage, next_stage in zip(self._stages, self._stages[1:]):
+            stage.next_stage = next_stage
+        self._insert_queue = queue.Queue(STAGE_QUEUE_SIZE)
+        # O último estágio entrega direto para a thread de gravação
+        self._stages[-1].next_stage = _InsertTarget(self._insert_queue)
+        self._threads = []
+
+    def start(self, file_paths):
+        file_paths = list(file_paths)
+        self._total = len(file_paths)
+        for stage in self._stages:
+            stage.start()
+        self._threads = [
+            threading.Thread(target=self._feed, args=(file_paths,), name="Import-feed", daemon=True),
+            threading.Thread(target=self._insert_worker, name="Import-insert", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def wait(self):
+        """Espera todas as threads do pipeline terminarem."""
+        for stage in self._stages:
+            stage.join()
+        for thread in self._threads:
+            thread.join()
+
+    # --- Estágios ----------------------------------------------------------------
+
+    def _probe(self, item):
+        file_extension = os.path.splitext(item.source_path)[1].lower()
+        if file_extension in IMAGE_EXTENSIONS:
+            item.media_type = "Imagem"
+            item.duration_seconds = DEFAULT_IMAGE_DURATION
+            # Só o cabeçalho é lido para saber as dimensões
+            image_size = QImageReader(item.source_path).size()
+            if image_size.isValid():
+                item.metadata.update(width=image_size.width(), height=image_size.height())
+        elif file_extension in VIDEO_EXTENSIONS:
+            item.media_type = "Vídeo"
+            with VideoProbe(item.source_path) as probe:
+                if probe.is_open():
+                    item.metadata.update(probe.metadata())
+                    media_duration = item.metadata.get("media_duration")
+                    item.duration_seconds = int(media_duration) if media_duration else 0
+        else:
+            item.media_type = "Outro"
+
+    def _hash(self, item):
+        item.content_hash = hash_file(item.source_path)
+
+    def _copy(self, item):
+        stored = self.repository.db_manager.find_stored_file(item.content_hash)
+        if stored and os.path.exists(stored[0]):
+            # Conteúdo já importado (talvez com outro nome ou extensão): reaproveita o blob
+            item.stored_path = stored[0]
+            if not self._blob_unchanged(item, *stored):
+                # Com hard link, editar o original no lugar muda o blob sem mudar o nome:
+                # grava o conteúdo certo de novo, o que conserta também as mídias antigas
+                print(f"Blob {item.stored_path} mudou desde a importação; gravando de novo.")
+                self.media_store.replace(item.source_path, item.stored_path)
+                self.media_store.sync([item.stored_path])
+        else:
+            item.stored_path, item.created_file = self.media_store.store(item.source_path, item.content_hash)
+        # Tamanho e mtime do blob, que é o arquivo lido pelo player e pelas miniaturas
+        stat = os.stat(item.stored_path)
+        item.metadata.update(file_size=stat.st_size, file_mtime_ns=stat.st_mtime_ns)
+
+    @staticmethod
+    def _blob_unchanged(item, stored_path, file_size, file_mtime_ns):
+        """True se o blob ainda é o arquivo gravado na importação (mesmo tamanho e mtime)."""
+        if file_size is None or file_mtime_ns is None:
+            # Mídia importada antes dos metadados: só o hash confirma o conteúdo
+            return hash_file(stored_path) == item.content_hash
+        stat = os.stat(stored_path)
+        return stat.st_size == file_size and stat.st_mtime_ns == file_mtime_ns
+
+    def _thumbnail(self, item):
+        # Só aquece o cache em disco, e só para blobs novos: os repetidos já têm miniatura
+        if not item.created_file:
+            return
+        try:
+            generate_thumbnail(item.stored_path, self.thumbnail_cache,
+                               item.metadata.get("frame_count"), item.metadata.get("fps"))
+        except Exception as e:
+            print(f"Erro ao gerar miniatura de {item.stored_path}: {e}")
+
+    def _insert_worker(self):
+        batch = []
+        waiting = {}  # índice -> item que chegou antes de algum anterior
+        next_index = 0
+        try:
+            while True:
+                try:
+                    item = self._insert_queue.get(timeout=INSERT_BATCH_DELAY)
+                except queue.Empty:
+                    next_index = self._release_in_order(waiting, next_index, batch)
+                    self._insert_batch(batch)
+                    continue
+                if item is _STOP:
+                    break
+                if self.is_cancelled():
+                    self._discard(item)
+                    continue
+                waiting[item.index] = item
+                next_index = self._release_in_order(waiting, next_index, batch)
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    self._insert_batch(batch)
+            # Todos os estágios terminaram: os índices que faltam foram descartados
+            batch.extend(waiting.pop(index) for index in sorted(waiting))
+            self._insert_batch(batch)
+        finally:
+            self._remove_orphans()
+            self.repository.db_manager.close_thread_connection()
+            self.finished.emit(self._imported, self.is_cancelled())
+
+    def _release_in_order(self, waiting, next_index, batch):
+        """Passa para o lote os itens que já podem ser gravados na ordem da seleção."""
+        while True:
+            if next_index in waiting:
+                batch.append(waiting.pop(next_index))
+            else:
+                with self._lock:
+                    if next_index not in self._skipped_indexes:
+                        return next_index
+                    self._skipped_indexes.discard(next_index)
+            next_index += 1
+
+    def _insert_batch(self, batch):
+        if not batch:
+            return
+        if self.is_cancelled():
+            for item in batch:
+                self._discard(item)
+            batch.clear()
+            return
+        try:
+            # Os blobs novos chegam ao disco antes das linhas que apontam para eles,
+            # com um fsync por lote em vez de um por arquivo
+            self.media_store.sync(item.stored_path for item in batch if item.created_file)
+            records = self.repository.add_medias(
+                [(item.name, item.media_type, item.stored_path, item.duration_seconds,
+                  item.content_hash, item.metadata)
+                 for item in batch]
+            )
+        except Exception as e:
+            print(f"Erro ao gravar mídias importadas: {e}")
+            for item in batch:
+                self._discard(item)
+            records = []
+        else:
+            with self._lock:
+                self._stored_paths.update(item.stored_path for item in batch)
+        self._imported += len(records)
+        for _ in batch:
+            self._item_done()
+        batch.clear()
+
+    # --- Controle ----------------------------------------------------------------
+
+    def _feed(self, file_paths):
+        first_stage = self._stages[0]
+        for index, file_path in enumerate(file_paths):
+            if self.is_cancelled():
+                break
+            self._put(first_stage.input, ImportItem(index, file_path))
+        for _ in range(first_stage.workers):
+            first_stage.input.put(_STOP)
+
+    def _put(self, target_queue, item):
+        """Entrega o item ao próximo estágio, esperando vaga sem ignorar o cancelamento."""
+        while True:
+            if self.is_cancelled():
+                self._discard(item)
+                return
+            try:
+                target_queue.put(item, timeout=CANCEL_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def _discard(self, item):
+        if item.created_file:
+            with self._lock:
+                self._orphan_paths.add(item.stored_path)
+
+    def _skip(self, item):
+        with self._lock:
+            self._skipped_indexes.add(item.index)
+
+    def _remove_orphans(self):
+        with self._lock:
+            orphan_paths = self._orphan_paths - self._stored_paths
+            self._orphan_paths.clear()
+        self.media_store.remove(orphan_paths)
+
+    def _item_done(self):
+        with self._lock:
+            self._done += 1
+            done = self._done
+        self.progress.emit(done, self._total)
@@ -1,25 +1,35 @@
 import os
-import platform
-import cv2
-from PySide6 import Shiboken
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                               QPushButton, QLabel, QListWidget, QListWidgetItem, 
-                               QStyle, QFileDialog, QButtonGroup, QRadioButton, QApplication)
-from PySide6.QtCore import QSize
+                               QPushButton, QLabel, QListView, QAbstractItemView,
+                               QStyle, QFileDialog, QButtonGroup, QRadioButton, QApplication,
+                               QProgressDialog)
+from PySide6.QtCore import Qt, QSize, QTimer
 from PySide6.QtGui import QIcon
-from gui.media_item import MediaItemWidget, THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT
+from gui.media_list_model import MediaListModel
+from gui.media_item_delegate import MediaItemDelegate
+from gui.thumbnail_loader import ThumbnailLoader, THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT, VISIBLE_PRIORITY
 from gui.media_edit_dialog import MediaEditDialog
-from gui.media_display import MediaDisplayWindow
+from gui.player_process import PlayerProcess, PLAYER_CHANGE_CONSUMER
+from gui.import_pipeline import ImportPipeline
 from utils.database import DatabaseManager
-from utils.path_helper import get_resource_path, get_data_path
+from utils.media_repository import MediaRepository, MEDIA_DELETED
+from utils.write_queue import MediaWriteQueue
+from utils.thumbnail_cache import ThumbnailCache
+from utils.media_store import MediaStore
+from utils.path_helper import get_resource_path
+
+# Espera (ms) após uma edição antes de pedir ao player que recarregue as mídias;
+# edições em sequência viram um único reload
+PLAYER_RELOAD_DELAY_MS = 500
+# Distância (px) acima e abaixo da viewport em que as miniaturas já são pedidas
+THUMBNAIL_PREFETCH_MARGIN = 300
 
 class MainWindow(QMainWindow):
 
     def __init__(self):
         
-        self.media_dir = get_data_path("media_files")
-        if not os.path.exists(self.media_dir):
-            os.makedirs(self.media_dir)
+        # Acervo endereçado por conteúdo onde ficam as cópias das mídias importadas
+        self.media_store = MediaStore()
 
         super().__init__()
         icon_path = get_resource_path(os.path.join("data", "assets", "logo.png"))
@@ -27,7 +37,33 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 800, 600)
         self.setWindowIcon(QIcon(icon_path))
         self.db_manager = DatabaseManager()
-        self.player_window = None 
+        # Descarta do change_log só o que todos os consumidores registrados já leram
+        self.db_manager.prune_change_log(self.db_manager.get_last_change_seq())
+        # Edições de agendamento/duração são gravadas em lote fora da thread da interface
+        self.write_queue = MediaWriteQueue(self.db_manager)
+        # Toda alteração de mídias passa pelo repositório, que emite os deltas
+        self.repository = MediaRepository(self.db_manager, self.write_queue, self, self.media_store)
+        self.repository.media_changed.connect(self.apply_media_change)
+        self.thumbnail_cache = ThumbnailCache()
+        # Miniaturas são geradas fora da thread da interface e chegam aos poucos
+        self.thumbnail_loader = ThumbnailLoader(self.thumbnail_cache, self)
+        self.thumbnail_loader.thumbnail_ready.connect(self.on_thumbnail_ready)
+        # Só as linhas perto da viewport pedem miniatura; o pedido é recalculado
+        # uma vez por volta do loop de eventos, por mais que a lista role
+        self.pending_thumbnails = set()
+        self.thumbnail_timer = QTimer(self)
+        self.thumbnail_timer.setSingleShot(True)
+        self.thumbnail_timer.setInterval(0)
+        self.thumbnail_timer.timeout.connect(self.request_visible_thumbnails)
+        self.import_pipeline = None
+        self.import_progress = None
+        # O player roda em outro processo; o gerenciador só envia comandos
+        self.player_process = PlayerProcess(self)
+        self.player_process.closed.connect(lambda: self.update_playback_buttons(False))
+        self.player_reload_timer = QTimer(self)
+        self.player_reload_timer.setSingleShot(True)
+        self.player_reload_timer.setInterval(PLAYER_RELOAD_DELAY_MS)
+        self.player_reload_timer.timeout.connect(self.reload_player)
         self.is_muted = True
         self.setup_ui()
         self.load_media_from_db()
@@ -89,16 +125,32 @@ class MainWindow(QMainWindow):
 
         main_layout.addLayout(control_layout)
 
-        self.media_list_widget = QListWidget()
-        self.media_list_widget.setViewMode(QListWidget.IconMode)
-        self.media_list_widget.setResizeMode(QListWidget.Adjust)
-        self.media_list_widget.setGridSize(QSize(THUMBNAIL_WIDTH + 180, THUMBNAIL_HEIGHT + 50))
-        self.media_list_widget.setIconSize(QSize(THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT))
+        self.media_model = MediaListModel(self.repository, self)
+        self.repository.media_changed.connect(self.media_model.apply_media_change)
+        self.media_model.rowsInserted.connect(self.schedule_thumbnail_update)
+        self.media_model.rowsRemoved.connect(self.schedule_thumbnail_update)
+        self.media_model.modelReset.connect(self.schedule_thumbnail_update)
+        self.media_model.dataChanged.connect(self.update_delete_button)
+
+        self.media_list_view = QListView()
+        self.media_list_view.setViewMode(QListView.IconMode)
+        self.media_list_view.setResizeMode(QListView.Adjust)
+        self.media_list_view.setMovement(QListView.Static)
+        # Todas as linhas têm o mesmo tamanho: o layout não consulta item por item
+        self.media_list_view.setUniformItemSizes(True)
+        self.media_list_view.setGridSize(QSize(THUMBNAIL_WIDTH + 180, THUMBNAIL_HEIGHT + 50))
+        self.media_list_view.setIconSize(QSize(THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT))
+        self.media_list_view.setSelectionMode(QAbstractItemView.MultiSelection)
+        self.media_list_view.setModel(self.media_model)
+
+        self.media_delegate = MediaItemDelegate(self.media_list_view)
+        self.media_delegate.edit_requested.connect(self.open_schedule_dialog)
+        self.media_list_view.setItemDelegate(self.media_delegate)
+
+        self.media_list_view.selectionModel().selectionChanged.connect(self.update_delete_button)
+        self.media_list_view.verticalScrollBar().valueChanged.connect(self.schedule_thumbnail_update)
         
-        self.media_list_widget.setSelectionMode(QListWidget.MultiSelection)
-        self.media_list_widget.itemSelectionChanged.connect(self.update_delete_button)
-        
-        main_layout.addWidget(self.media_list_widget)
+        main_layout.addWidget(self.media_list_view)
 
         self.upload_button.clicked.connect(self.upload_media)
         self.delete_button.clicked.connect(self.delete_selected_items)
@@ -123,29 +175,75 @@ class MainWindow(QMainWindow):
         return QApplication.primaryScreen()
     
     def load_media_from_db(self):
-        self.media_list_widget.clear()
-        medias = self.db_manager.get_all_medias()
-        for media in medias:
-            media_id, name, media_type, file_path, duration_seconds, start_date, start_time, end_date, end_time = media
-            
-            scheduled_data = {
-                'start_date': start_date,
-                'start_time': start_time,
-                'end_date': end_date,
-                'end_time': end_time
-            }
-            self.add_media_item(media_id, name, media_type, file_path, duration_seconds, scheduled_data)
-
-    def add_media_item(self, media_id, name, type, file_path, duration, scheduled_data):
-        item_widget = MediaItemWidget(media_id, name, type, file_path, duration, scheduled_data)
-        
-        item_widget.edit_requested.connect(lambda widget: self.open_schedule_dialog(widget))
-        item_widget.checkbox_state_changed.connect(lambda widget: self.update_delete_button())
+        # O modelo busca as páginas sozinho (fetchMore) conforme a lista é rolada
+        self.media_model.reload()
+
+    def media_ids_in_range(self, margin=0):
+        """IDs das mídias cujas linhas cruzam a viewport ampliada por `margin` px, em ordem."""
+        list_view = self.media_list_view
+        model = self.media_model
+        viewport_rect = list_view.viewport().rect()
+        top = viewport_rect.top() - margin
+        bottom = viewport_rect.bottom() + margin
+
+        # As linhas são dispostas em ordem: busca binária pela primeira que termina abaixo de `top`
+        low, high = 0, model.rowCount()
+        while low < high:
+            middle = (low + high) // 2
+            if list_view.visualRect(model.index(middle)).bottom() < top:
+                low = middle + 1
+            else:
+                high = middle
+
+        media_ids = []
+        for row in range(low, model.rowCount()):
+            if list_view.visualRect(model.index(row)).top() > bottom:
+                break
+            media_ids.append(model.media_at(row).id)
+        return media_ids
+
+    def visible_media_ids(self):
+        """IDs das mídias com linha visível na viewport, em ordem de exibição."""
+        return self.media_ids_in_range()
+
+    def schedule_thumbnail_update(self, *args):
+        # Não conectar sinais direto em QTimer.start: o argumento viraria o intervalo
+        self.thumbnail_timer.start()
 
-        list_item = QListWidgetItem(self.media_list_widget)
-        list_item.setSizeHint(item_widget.sizeHint())
-        self.media_list_widget.addItem(list_item)
-        self.media_list_widget.setItemWidget(list_item, item_widget)
+    def request_visible_thumbnails(self):
+        """Pede as miniaturas das linhas visíveis e da margem; esquece as que saíram dela."""
+        if not self.isVisible():
+            return
+        visible_ids = self.visible_media_ids()
+        nearby_ids = self.media_ids_in_range(THUMBNAIL_PREFETCH_MARGIN)
+        # O que está na tela nunca é descartado do cache em memória
+        self.media_model.pixmap_cache.pin(visible_ids)
+
+        for media_id in nearby_ids:
+            if media_id in self.pending_thumbnails or not self.media_model.needs_thumbnail(media_id):
+                continue
+            row = self.media_model.row_for_id(media_id)
+            self.thumbnail_loader.request(self.media_model.media_at(row))
+            self.pending_thumbnails.add(media_id)
+        self.thumbnail_loader.prioritize(visible_ids, VISIBLE_PRIORITY)
+
+        out_of_range = self.pending_thumbnails.difference(nearby_ids)
+        if out_of_range:
+            self.thumbnail_loader.cancel(out_of_range)
+            self.pending_thumbnails -= out_of_range
+
+    def on_thumbnail_ready(self, media_id, image, sprite):
+        self.pending_thumbnails.discard(media_id)
+        self.media_model.set_thumbnail(media_id, image, sprite)
+
+    def apply_media_change(self, change):
+        """Ações da janela para cada delta; a lista em si é atualizada pelo modelo."""
+        if self.player_process.is_running():
+            self.player_reload_timer.start()
+        if change.kind == MEDIA_DELETED:
+            self.thumbnail_loader.cancel(change.media_ids)
+            self.pending_thumbnails.difference_update(change.media_ids)
+            self.update_delete_button()
 
     def upload_media(self):
         file_dialog = QFileDialog(self)
@@ -153,169 +251,111 @@ class MainWindow(QMainWindow):
         file_dialog.setNameFilters(["Mídias Suportadas (*.jpg *.jpeg *.png *.gif *.mp4 *.avi *.mov)"])
         
         if file_dialog.exec():
-            selected_files = file_dialog.selectedFiles()
-            
-            for file_path in selected_files:
-                file_name = os.path.basename(file_path)
-                file_extension = os.path.splitext(file_name)[1].lower()
-                
-                duration_seconds = None
-                
-                if file_extension in [".jpg", ".jpeg", ".png", ".gif"]:
-                    file_type = "Imagem"
-                    duration_seconds = 5
-                elif file_extension in [".mp4", ".avi", ".mov"]:
-                    file_type = "Vídeo"
-                    cap = cv2.VideoCapture(file_path)
-                    if cap.isOpened():
-                        fps = cap.get(cv2.CAP_PROP_FPS)
-                        frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-                        duration_seconds = int(frame_count / fps) if fps > 0 else 0
-                        cap.release()
-                else:
-                    file_type = "Outro"
-                
-                media_id = self.db_manager.add_media(file_name, file_type, file_path, duration_seconds)
-                scheduled_data = {'start_date': None, 'start_time': None, 'end_date': None, 'end_time': None}
-                self.add_media_item(media_id, file_name, file_type, file_path, duration_seconds, scheduled_data)
-
-    def open_schedule_dialog(self, media_item_widget):
-        scheduled_data = {
-            'start_date': media_item_widget.schedule_start_date,
-            'start_time': media_item_widget.schedule_start_time,
-            'end_date': media_item_widget.schedule_end_date,
-            'end_time': media_item_widget.schedule_end_time
-        }
-        
-        dialog = MediaEditDialog(media_item_widget.media_type, media_item_widget.duration_seconds, scheduled_data, self)
+            self.start_import(file_dialog.selectedFiles())
+
+    def start_import(self, file_paths):
+        """Importa os arquivos em segundo plano, com barra de progresso e cancelamento."""
+        if not file_paths or self.import_pipeline is not None:
+            return
+        self.import_pipeline = ImportPipeline(self.repository, self.media_store, self.thumbnail_cache, self)
+        self.import_progress = QProgressDialog("Importando mídias...", "Cancelar", 0, len(file_paths), self)
+        self.import_progress.setWindowTitle("Upload de Mídia")
+        self.import_progress.setWindowModality(Qt.NonModal)
+        self.import_progress.setMinimumDuration(0)
+        self.import_progress.setAutoReset(False)
+        self.import_progress.setAutoClose(False)
+        self.import_progress.setValue(0)
+
+        self.import_pipeline.progress.connect(self.on_import_progress)
+        self.import_pipeline.finished.connect(self.on_import_finished)
+        self.import_progress.canceled.connect(self.import_pipeline.cancel)
+        self.upload_button.setDisabled(True)
+        self.update_delete_button()
+        self.import_pipeline.start(file_paths)
+
+    def on_import_progress(self, done, total):
+        if self.import_progress is not None:
+            self.import_progress.setLabelText(f"Importando mídias... ({done} de {total})")
+            self.import_progress.setValue(done)
+
+    def on_import_finished(self, imported, cancelled):
+        if self.import_progress is not None:
+            self.import_progress.close()
+            self.import_progress.deleteLater()
+            self.import_progress = None
+        if self.import_pipeline is not None:
+            self.import_pipeline.deleteLater()
+            self.import_pipeline = None
+        # Durante a reprodução o upload continua bloqueado (ver update_playback_buttons)
+        self.upload_button.setDisabled(self.player_process.is_running())
+        self.update_delete_button()
+
+    def open_schedule_dialog(self, media):
+        dialog = MediaEditDialog(media.type, media.duration_seconds, media.scheduled_data, self)
         
         if dialog.exec():
             new_data = dialog.get_schedule_data()
-            
-            self.db_manager.update_media_schedule(
-                media_item_widget.media_id,
+
+            schedule = (
                 new_data['start_date'],
                 new_data['start_time'],
                 new_data['end_date'],
                 new_data['end_time']
             )
-
-            if media_item_widget.media_type == "Imagem":
-                self.db_manager.update_media_duration(media_item_widget.media_id, new_data['duration'])
-                media_item_widget.duration_seconds = new_data['duration']
-            
-            media_item_widget.schedule_start_date = new_data['start_date']
-            media_item_widget.schedule_start_time = new_data['start_time']
-            media_item_widget.schedule_end_date = new_data['end_date']
-            media_item_widget.schedule_end_time = new_data['end_time']
-            
-            media_item_widget.update_info_labels()
-
-    def update_delete_button(self):
-        is_any_checked = False
-        for i in range(self.media_list_widget.count()):
-            item = self.media_list_widget.item(i)
-            item_widget = self.media_list_widget.itemWidget(item)
-            if item_widget and item_widget.checkbox.isChecked():
-                is_any_checked = True
-                break
-        
-        is_any_selected = len(self.media_list_widget.selectedItems()) > 0
-        self.delete_button.setDisabled(not (is_any_checked or is_any_selected))
+            duration = new_data['duration'] if media.type == "Imagem" else None
+            self.repository.update_media(media, schedule=schedule, duration_seconds=duration)
+
+    def selected_media_ids(self):
+        """IDs marcados no checkbox ou selecionados na lista, sem repetição."""
+        media_ids = self.media_model.checked_media_ids()
+        for index in self.media_list_view.selectionModel().selectedIndexes():
+            media_id = self.media_model.media_at(index.row()).id
+            if media_id not in media_ids:
+                media_ids.append(media_id)
+        return media_ids
+
+    def update_delete_button(self, *args):
+        is_any_checked = bool(self.media_model.checked_media_ids())
+        is_any_selected = self.media_list_view.selectionModel().hasSelection()
+        # Durante a importação não há remoção: uma importação pode estar reaproveitando
+        # o blob que a remoção apagaria por ter ficado sem referência
+        is_importing = self.import_pipeline is not None
+        self.delete_button.setDisabled(is_importing or not (is_any_checked or is_any_selected))
 
     def delete_selected_items(self):
-        items_to_delete = []
-        media_ids_to_delete = []
-        
-        for item in self.media_list_widget.selectedItems():
-            item_widget = self.media_list_widget.itemWidget(item)
-            if item not in items_to_delete:
-                items_to_delete.append(item)
-                media_ids_to_delete.append(item_widget.media_id)
-
-        for i in range(self.media_list_widget.count()):
-            item = self.media_list_widget.item(i)
-            item_widget = self.media_list_widget.itemWidget(item)
-            if item_widget and item_widget.checkbox.isChecked():
-                if item not in items_to_delete:
-                    items_to_delete.append(item)
-                    media_ids_to_delete.append(item_widget.media_id)
-        
-        self.db_manager.delete_medias(media_ids_to_delete)
-
-        for item in sorted(items_to_delete, key=self.media_list_widget.row, reverse=True):
-            row = self.media_list_widget.row(item)
-            self.media_list_widget.takeItem(row)
+        if self.import_pipeline is not None:
+            return
+        # A remoção das linhas vem pelo delta emitido pelo repositório
+        self.repository.delete_medias(self.selected_media_ids())
 
     def play_media(self):
-        # 1. Busca mídias ativas no banco (Filtro de agendamento)
-        media_list = self.db_manager.get_active_medias()
-
-        if not media_list:
-            print("Nenhuma mídia ativa para exibir.")
+        # O player lê o banco em outro processo: as edições pendentes precisam estar gravadas
+        if not self.write_queue.flush():
+            print("Erro ao gravar as alterações de mídias; o player não foi iniciado.")
             return
-        
-        # 2. Limpeza de segurança: Garante que não existam dois players rodando
-        if self.player_window:
-            try:
-                if Shiboken.isValid(self.player_window): 
-                    self.player_window.stop_playback()
-                    self.player_window.deleteLater()
-            except Exception as e:
-                print(f"Erro ao limpar player anterior: {e}")
-            self.player_window = None
-
-        # 3. Captura configurações da interface
+        self.player_reload_timer.stop()
+        self.player_process.stop()
+        # O player novo parte de uma leitura completa: seu cursor avança até o fim do
+        # log, e só é descartado o que os demais consumidores também já leram
+        change_seq = self.db_manager.get_last_change_seq()
+        self.db_manager.set_change_cursor(PLAYER_CHANGE_CONSUMER, change_seq)
+        self.db_manager.prune_change_log(change_seq)
         display_mode = "Fullscreen" if self.full_screen_radio.isChecked() else "Original"
-        selected_screen = self.get_selected_screen()
-        screen_geometry = selected_screen.geometry()
-
-        # 4. Instancia o player (sem mostrar ainda)
-        self.player_window = MediaDisplayWindow(
-            media_list, 
-            is_muted_at_start=self.is_muted,
-            display_mode=display_mode
-        )
-        
-        # Conecta o sinal para reativar os botões quando o player fechar
-        self.player_window.closed.connect(lambda: self.update_playback_buttons(False))
-
-        # 5. Lógica de Posicionamento por Sistema Operacional
-        if platform.system() == "Windows":
-            # No Windows, vinculamos a tela e movemos para a coordenada absoluta.
-            # Se a Tela 2 começa em X=1920, move(1920, 0) coloca ela lá instantaneamente.
-            self.player_window.setScreen(selected_screen)
-            self.player_window.move(screen_geometry.topLeft())
-            
-            if display_mode == "Fullscreen":
-                self.player_window.showFullScreen()
-            else:
-                self.player_window.show()
-        else:
-            # No Linux (Wayland/COSMIC), o SO ignora o move().
-            # Tentamos o setScreen, mas o Linux geralmente decide a tela sozinho.
-            self.player_window.setScreen(selected_screen)
-            self.player_window.setGeometry(screen_geometry)
-            
-            if display_mode == "Fullscreen":
-                self.player_window.showFullScreen()
-            else:
-                self.player_window.show()
-            
-            # Força o foco no Linux
-            self.player_window.raise_()
-            self.player_window.activateWindow()
-
-        # 6. Inicia o ciclo de reprodução e atualiza botões
-        self.player_window.start_playback()
+        self.player_process.start(display_mode, self.get_selected_screen().name(), self.is_muted)
         self.update_playback_buttons(True)
 
     def stop_media(self):
-        if self.player_window:
-            self.player_window.stop_playback()
-            self.player_window = None
+        self.player_reload_timer.stop()
+        self.player_process.stop()
         self.update_playback_buttons(False)
 
+    def reload_player(self):
+        # O reload lê o change_log, então as edições da fila precisam estar no banco
+        if not self.write_queue.flush():
+            print("Erro ao gravar as alterações de mídias; o player não foi atualizado.")
+            return
+        self.player_process.reload()
+
     def toggle_audio(self, initial=False):
         if not initial:
             self.is_muted = not self.is_muted
@@ -326,11 +366,30 @@ class MainWindow(QMainWindow):
             icon = self.style().standardIcon(QStyle.SP_MediaVolume)
         self.audio_button.setIcon(icon)
 
-        if self.player_window:
-            self.player_window.set_muted(self.is_muted)
+        if self.player_process.is_running():
+            self.player_process.set_muted(self.is_muted)
 
     def update_playback_buttons(self, is_playing):
         """Ativa/Desativa botões baseado no estado do player."""
         self.play_button.setDisabled(is_playing)
         self.stop_button.setEnabled(is_playing)
-        self.upload_button.setDisabled(is_playing)
\ No newline at end of file
+        self.upload_button.setDisabled(is_playing or self.import_pipeline is not None)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.schedule_thumbnail_update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_thumbnail_update()
+
+    def closeEvent(self, event):
+        self.stop_media()
+        if self.import_pipeline is not None:
+            self.import_pipeline.cancel()
+            self.import_pipeline.wait()
+        self.thumbnail_loader.shutdown()
+        # Garante que as edições enfileiradas cheguem ao disco antes de sair
+        self.write_queue.close()
+        self.db_manager.close()
+        super().closeEvent(event)
@@ -1,17 +1,59 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QSizePolicy
-from PySide6.QtGui import QPixmap
-from PySide6.QtCore import Qt, QUrl, QTimer, Signal
+import time
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QStackedLayout
+from PySide6.QtCore import Qt, QUrl, QTimer, Signal, QSize
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PySide6.QtMultimediaWidgets import QVideoWidget
+from gui.display_canvas import DisplayCanvas
+from gui.frame_cache import FrameCache
+from gui.frame_loader import FramePrefetcher, frame_key, load_display_image
+
+# QTimer usa int de 32 bits em ms (~24 dias). Para fronteiras mais distantes o
+# timer dispara antes, não encontra mudança e é rearmado.
+MAX_SCHEDULE_TIMER_MS = 24 * 24 * 60 * 60 * 1000
+
+
+class VideoPipeline:
+    """Um QMediaPlayer com saída de áudio e QVideoWidget próprios.
+
+    O player usa dois destes alternadamente: enquanto um exibe o vídeo atual,
+    o outro já carregou o próximo e o mantém pausado no primeiro quadro.
+    """
+
+    def __init__(self, is_muted):
+        self.file_path = None
+        self.video_widget = QVideoWidget()
+        self.player = QMediaPlayer()
+        self.audio_output = QAudioOutput()
+        self.audio_output.setMuted(is_muted)
+        self.player.setAudioOutput(self.audio_output)
+        self.player.setVideoOutput(self.video_widget)
+
+    def load(self, file_path):
+        """Carrega o vídeo e pausa no início: decodificador aberto e primeiro quadro pronto."""
+        if self.file_path == file_path:
+            # Mesmo vídeo de novo (ex.: lista com um vídeo só): só volta ao início
+            self.player.setPosition(0)
+        else:
+            self.file_path = file_path
+            self.player.setSource(QUrl.fromLocalFile(file_path))
+        self.player.pause()
+
+    def stop(self):
+        self.player.stop()
+
 
 class MediaDisplayWindow(QWidget):
     closed = Signal()
 
-    def __init__(self, media_list, is_muted_at_start=True, display_mode="Fullscreen"):
+    def __init__(self, media_list, is_muted_at_start=True, display_mode="Fullscreen", schedule_index=None):
         super().__init__()
         self.media_list = media_list
-        self.current_media_index = 0
+        self.current_media_index = -1
+        self.current_media = None
         self.display_mode = display_mode # "Fullscreen" ou "Original"
+        # Com o índice, a lista ativa é trocada a cada fronteira de agendamento
+        # sem reconstruir a janela nem consultar o banco.
+        self.schedule_index = schedule_index
         
         self.setCursor(Qt.BlankCursor)
         self.setStyleSheet("background-color: black;")
@@ -22,104 +64,223 @@ class MediaDisplayWindow(QWidget):
 
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
+        # Todas as superfícies ficam empilhadas com a mesma geometria: trocar a
+        # mídia exibida é só mudar o widget do topo, sem recalcular o layout.
+        self.display_stack = QStackedLayout()
+        main_layout.addLayout(self.display_stack)
         
-        self.image_label = QLabel()
-        # No Fullscreen, queremos que a imagem ocupe tudo
-        self.image_label.setAlignment(Qt.AlignCenter)
-        self.image_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        # Importante: permitir que o conteúdo estique
-        self.image_label.setScaledContents(True) 
-        self.image_label.hide()
+        # As imagens já chegam escaladas (esticadas para a tela no Fullscreen) e
+        # são pintadas 1:1, centralizadas
+        self.image_canvas = DisplayCanvas()
+        self.display_stack.addWidget(self.image_canvas)
 
-        self.video_widget = QVideoWidget()
-        self.video_widget.hide()
-        
-        self.media_player = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        self.media_player.setAudioOutput(self.audio_output)
-        self.media_player.setVideoOutput(self.video_widget)
-        self.media_player.mediaStatusChanged.connect(self.handle_media_status)
+        # Dois pipelines de vídeo: o próximo vídeo é pré-carregado no ocioso e
+        # assume no EndOfMedia do atual, sem intervalo de carregamento
+        self.video_pipelines = [VideoPipeline(is_muted_at_start), VideoPipeline(is_muted_at_start)]
+        for pipeline in self.video_pipelines:
+            self.display_stack.addWidget(pipeline.video_widget)
+            pipeline.player.mediaStatusChanged.connect(
+                lambda status, pipeline=pipeline: self.handle_media_status(pipeline, status)
+            )
+        self.current_video = None    # pipeline em exibição
+        self.preloaded_video = None  # pipeline com o próximo vídeo pausado
         
         self.set_muted(is_muted_at_start)
         
         self.image_timer = QTimer(self)
         self.image_timer.setSingleShot(True)
         self.image_timer.timeout.connect(self.play_next_media)
-        
-        main_layout.addWidget(self.image_label)
-        main_layout.addWidget(self.video_widget)
+
+        self.schedule_timer = QTimer(self)
+        self.schedule_timer.setSingleShot(True)
+        self.schedule_timer.timeout.connect(self.refresh_schedule)
+
+        # Quadros prontos ficam em cache: num loop, cada imagem é decodificada uma vez.
+        # A próxima imagem é decodificada e escalada em segundo plano durante a atual.
+        self.frame_cache = FrameCache()
+        self.frame_prefetcher = FramePrefetcher(self.frame_cache, self)
         
     def start_playback(self):
+        self.arm_schedule_timer()
         self.play_next_media()
 
     def stop_playback(self):
-        self.media_player.stop()
+        for pipeline in self.video_pipelines:
+            pipeline.stop()
         if self.image_timer:
             self.image_timer.stop()
+        self.schedule_timer.stop()
+        self.frame_prefetcher.shutdown()
+        self.frame_cache.clear()
         self.close()
         self.deleteLater() 
 
+    def arm_schedule_timer(self):
+        """Arma um único timer para a próxima fronteira de agendamento."""
+        self.schedule_timer.stop()
+        if self.schedule_index is None:
+            return
+        next_boundary = self.schedule_index.next_boundary(int(time.time()))
+        if next_boundary is None:
+            return
+        delay_ms = max(0, int((next_boundary - time.time()) * 1000))
+        self.schedule_timer.start(min(delay_ms, MAX_SCHEDULE_TIMER_MS))
+
+    def refresh_schedule(self):
+        """Troca a lista ativa mantendo a mídia atual em exibição."""
+        new_list = self.schedule_index.active_at(int(time.time()))
+        was_idle = self.current_media is None
+        self.media_list = new_list
+
+        if self.current_media is not None:
+            # Reposiciona o cursor para que a próxima mídia siga a ordem da nova
+            # lista. Se a atual expirou, ela termina e a seguinte assume.
+            current_id = self.current_media.id
+            position = 0
+            while position < len(new_list) and new_list[position].id < current_id:
+                position += 1
+            if position < len(new_list) and new_list[position].id == current_id:
+                self.current_media_index = position
+            else:
+                self.current_media_index = position - 1
+
+        self.arm_schedule_timer()
+
+        if was_idle and self.media_list:
+            self.current_media_index = -1
+            self.play_next_media()
+
+    def apply_media_changes(self, records=(), deleted_ids=()):
+        """Aplica de uma vez mídias inseridas/alteradas e removidas à programação.
+
+        Só as mídias informadas são atualizadas no índice; nada é reconstruído
+        nem relido do banco.
+        """
+        if self.schedule_index is None:
+            return
+        self.schedule_index.apply(records, deleted_ids)
+        self.refresh_schedule()
+
     def play_next_media(self):
         if not self.media_list:
+            self.current_media = None
+            self.stop_current_video()
+            self.image_canvas.clear()
+            self.display_stack.setCurrentWidget(self.image_canvas)
+            # Sem mídias ativas agora: aguarda a próxima fronteira, se houver.
+            if self.schedule_timer.isActive():
+                return
             self.stop_playback()
             return
 
+        self.current_media_index += 1
         if self.current_media_index >= len(self.media_list):
             self.current_media_index = 0
 
-        media_data = self.media_list[self.current_media_index]
-        media_type = media_data[2]
-        file_path = media_data[3]
-        duration_seconds = media_data[4]
+        media = self.media_list[self.current_media_index]
+        self.current_media = media
 
-        self.image_label.hide()
-        self.video_widget.hide()
-        
-        if media_type == "Imagem":
-            self.play_image(file_path, duration_seconds)
-        elif media_type == "Vídeo":
-            self.play_video(file_path)
-
-    def play_image(self, file_path, duration_seconds):
-        pixmap = QPixmap(file_path)
-        if not pixmap.isNull():
+        if media.type == "Imagem":
+            self.play_image(media)
+        elif media.type == "Vídeo":
+            self.play_video(media.file_path, media.width, media.height)
+        self.prefetch_next_media()
+
+    def prefetch_next_media(self):
+        """Prepara a próxima mídia da lista enquanto a atual é exibida.
+
+        Imagens são decodificadas em segundo plano; vídeos são carregados e
+        pausados no pipeline de vídeo ocioso.
+        """
+        if not self.media_list:
+            return
+        screen_size = self.screen().size()
+        device_pixel_ratio = self.devicePixelRatioF()
+        # Ordem de exibição das imagens a partir da atual, para o descarte do cache
+        count = len(self.media_list)
+        self.frame_cache.set_playlist(
+            frame_key(media, screen_size, self.display_mode, device_pixel_ratio)
+            for media in (self.media_list[(self.current_media_index + offset) % count]
+                          for offset in range(count))
+            if media.type == "Imagem"
+        )
+
+        next_media = self.media_list[(self.current_media_index + 1) % count]
+        if next_media.type == "Imagem":
+            self.frame_prefetcher.request(next_media, screen_size, self.display_mode, device_pixel_ratio)
+        elif next_media.type == "Vídeo":
+            pipeline = self.idle_video_pipeline()
+            pipeline.load(next_media.file_path)
+            self.preloaded_video = pipeline
+
+    def idle_video_pipeline(self):
+        """O pipeline de vídeo que não está em exibição."""
+        for pipeline in self.video_pipelines:
+            if pipeline is not self.current_video:
+                return pipeline
+
+    def stop_current_video(self):
+        if self.current_video is not None:
+            self.current_video.stop()
+            self.current_video = None
+
+    def play_image(self, media):
+        screen_size = self.screen().size()
+        device_pixel_ratio = self.devicePixelRatioF()
+        key = frame_key(media, screen_size, self.display_mode, device_pixel_ratio)
+        image = self.frame_cache.get(key)
+        if image is None:
+            # Primeira passagem pela imagem, ou o prefetch ainda não terminou
+            image = load_display_image(media.file_path, screen_size, self.display_mode, device_pixel_ratio)
+            if image is not None:
+                self.frame_cache.put(key, image)
+        if image is not None:
             if self.display_mode == "Fullscreen":
-                # Ignora a proporção para preencher a tela (causa distorção proposital)
-                aspect_ratio = Qt.IgnoreAspectRatio
-                self.resize(self.screen().size())
+                # A imagem já vem esticada para a tela (distorção proposital)
+                self.resize(screen_size)
             else:
-                # Mantém o tamanho real da imagem
-                aspect_ratio = Qt.KeepAspectRatio
-                self.resize(pixmap.size())
-
-            scaled_pixmap = pixmap.scaled(
-                self.size(), 
-                aspect_ratio, 
-                Qt.SmoothTransformation
-            )
-            self.image_label.setPixmap(scaled_pixmap)
-            self.image_label.show()
-            self.image_timer.start(duration_seconds * 1000)
-            self.current_media_index += 1
+                # Mantém o tamanho real da imagem (já reduzida se não cabia na tela)
+                self.resize(image.deviceIndependentSize().toSize())
 
-    def play_video(self, file_path):
-        self.media_player.setSource(QUrl.fromLocalFile(file_path))
+            self.image_canvas.set_image(image)
+            self.display_stack.setCurrentWidget(self.image_canvas)
+            self.stop_current_video()
+            self.image_timer.start(media.duration_seconds * 1000)
+
+    def play_video(self, file_path, width=None, height=None):
+        """Reproduz o vídeo; `width`/`height` vêm dos metadados gravados na importação.
+
+        Se o vídeo já foi pré-carregado no pipeline ocioso, a troca é só mostrar
+        o widget dele e dar play; senão ele é carregado agora.
+        """
+        pipeline = self.preloaded_video
+        self.preloaded_video = None
+        if pipeline is None or pipeline.file_path != file_path:
+            pipeline = self.idle_video_pipeline()
+            pipeline.load(file_path)
         
         if self.display_mode == "Fullscreen":
             # Força o vídeo a esticar para preencher o QVideoWidget
-            self.video_widget.setAspectRatioMode(Qt.IgnoreAspectRatio)
+            pipeline.video_widget.setAspectRatioMode(Qt.IgnoreAspectRatio)
             self.resize(self.screen().size())
         else:
-            # No modo original, teríamos que ajustar o tamanho da janela 
-            # para o tamanho do vídeo (isso requer metadados do vídeo)
-            self.video_widget.setAspectRatioMode(Qt.KeepAspectRatio)
-            
-        self.video_widget.show()
-        self.media_player.play()
-
-    def handle_media_status(self, status):
-        if status == QMediaPlayer.MediaStatus.EndOfMedia:
-            self.current_media_index += 1
+            # No modo original a janela assume o tamanho do vídeo (limitado à tela),
+            # sem abrir o arquivo só para descobri-lo
+            pipeline.video_widget.setAspectRatioMode(Qt.KeepAspectRatio)
+            if width and height:
+                self.resize(QSize(width, height).boundedTo(self.screen().size()))
+
+        previous_video = self.current_video
+        self.current_video = pipeline
+        self.display_stack.setCurrentWidget(pipeline.video_widget)
+        pipeline.player.play()
+        # O anterior só para depois que o novo já está na tela
+        if previous_video is not None and previous_video is not pipeline:
+            previous_video.stop()
+
+    def handle_media_status(self, pipeline, status):
+        # Só o pipeline em exibição avança a lista; o ocioso também emite status ao pré-carregar
+        if pipeline is self.current_video and status == QMediaPlayer.MediaStatus.EndOfMedia:
             self.play_next_media()
 
     # Metodo que para o Player ao aperta ESC (Desativada por Padrao)
@@ -129,7 +290,8 @@ class MediaDisplayWindow(QWidget):
         super().keyPressEvent(event)"""
 
     def set_muted(self, is_muted):
-        self.audio_output.setMuted(is_muted)
+        for pipeline in self.video_pipelines:
+            pipeline.audio_output.setMuted(is_muted)
 
     def closeEvent(self, event):
         self.closed.emit()
@@ -0,0 +1,194 @@
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle, QStyleOptionButton, QApplication
+from PySide6.QtGui import QColor, QFont, QFontMetrics
+from PySide6.QtCore import Qt, Signal, QEvent, QRect, QSize
+from gui.media_list_model import MEDIA_ROLE, SPRITE_ROLE
+from gui.thumbnail_loader import THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT
+
+ITEM_MARGIN = 5
+CHECKBOX_SIZE = 25
+EDIT_BUTTON_SIZE = 30
+DETAILS_WIDTH = 170
+PLACEHOLDER_COLOR = QColor(230, 230, 230)
+BORDER_COLOR = QColor("#ccc")
+EDIT_BUTTON_COLOR = QColor(255, 255, 255, 100)
+
+
+class MediaItemDelegate(QStyledItemDelegate):
+    """Desenha cada mídia da biblioteca: miniatura, checkbox, botão de edição e detalhes.
+
+    Nada é widget: tudo é pintado em paint() e os cliques são tratados em
+    editorEvent(), então 100k linhas custam o mesmo que algumas dezenas.
+    """
+    edit_requested = Signal(object)  # MediaRecord
+
+    def __init__(self, view, parent=None):
+        super().__init__(parent or view)
+        self.view = view
+        self.edit_icon = view.style().standardIcon(QStyle.SP_FileDialogDetailedView)
+        # Scrub do sprite: (linha, fração horizontal) sob o mouse
+        self.hover_row = None
+        self.hover_fraction = 0.0
+        view.setMouseTracking(True)
+        view.viewport().installEventFilter(self)
+
+    # --- Geometria ---------------------------------------------------------------
+
+    @staticmethod
+    def thumbnail_rect(item_rect):
+        return QRect(item_rect.left() + ITEM_MARGIN, item_rect.top() + ITEM_MARGIN,
+                     THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT)
+
+    @classmethod
+    def checkbox_rect(cls, item_rect):
+        thumbnail = cls.thumbnail_rect(item_rect)
+        return QRect(thumbnail.left() + ITEM_MARGIN, thumbnail.top() + ITEM_MARGIN,
+                     CHECKBOX_SIZE, CHECKBOX_SIZE)
+
+    @classmethod
+    def edit_button_rect(cls, item_rect):
+        thumbnail = cls.thumbnail_rect(item_rect)
+        return QRect(thumbnail.right() - ITEM_MARGIN - EDIT_BUTTON_SIZE + 1, thumbnail.top() + ITEM_MARGIN,
+                     EDIT_BUTTON_SIZE, EDIT_BUTTON_SIZE)
+
+    def sizeHint(self, option, index):
+        return QSize(THUMBNAIL_WIDTH + DETAILS_WIDTH, THUMBNAIL_HEIGHT + 2 * ITEM_MARGIN)
+
+    # --- Pintura -----------------------------------------------------------------
+
+    def paint(self, painter, option, index):
+        media = index.data(MEDIA_ROLE)
+        if media is None:
+            return
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+
+        painter.save()
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, widget)
+
+        thumbnail_rect = self.thumbnail_rect(option.rect)
+        self._paint_thumbnail(painter, thumbnail_rect, index)
+
+        checkbox_option = QStyleOptionButton()
+        checkbox_option.rect = self.checkbox_rect(option.rect)
+        checkbox_option.state = QStyle.State_Enabled
+        checkbox_option.state |= (QStyle.State_On if index.data(Qt.CheckStateRole) == Qt.Checked
+                                  else QStyle.State_Off)
+        style.drawPrimitive(QStyle.PE_IndicatorCheckBox, checkbox_option, painter, widget)
+
+        edit_rect = self.edit_button_rect(option.rect)
+        painter.fillRect(edit_rect, EDIT_BUTTON_COLOR)
+        self.edit_icon.paint(painter, edit_rect.adjusted(6, 6, -6, -6))
+
+        details_rect = QRect(thumbnail_rect.right() + 2 * ITEM_MARGIN, thumbnail_rect.top(),
+                             option.rect.right() - thumbnail_rect.right() - 3 * ITEM_MARGIN,
+                             THUMBNAIL_HEIGHT)
+        self._paint_details(painter, details_rect, option, media)
+        painter.restore()
+
+    def _paint_thumbnail(self, painter, rect, index):
+        pixmap = index.data(Qt.DecorationRole)
+        source = None
+        sprite = index.data(SPRITE_ROLE)
+        if sprite is not None and index.row() == self.hover_row:
+            frames = max(1, sprite.width() // THUMBNAIL_WIDTH)
+            frame = min(frames - 1, int(self.hover_fraction * frames))
+            pixmap = sprite
+            source = QRect(frame * THUMBNAIL_WIDTH, 0, THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT)
+
+        if pixmap is None:
+            painter.fillRect(rect, PLACEHOLDER_COLOR)
+        else:
+            if source is None:
+                source = pixmap.rect()
+            target = QRect(0, 0, source.width(), source.height())
+            target.moveCenter(rect.center())
+            painter.drawPixmap(target, pixmap, source)
+
+        painter.setPen(BORDER_COLOR)
+        painter.drawRoundedRect(rect.adjusted(0, 0, -1, -1), 5, 5)
+
+    def _paint_details(self, painter, rect, option, media):
+        lines = [
+            ("Nome:", media.name),
+            ("Tipo:", media.type),
+            ("Duração:", f"{media.duration_seconds} segundos"),
+        ]
+        if media.schedule_start_date:
+            lines.append(("Agendamento:", ""))
+            lines.append(("", f"Início: {media.schedule_start_date} às {media.schedule_start_time}"))
+            if media.schedule_end_date:
+                lines.append(("", f"Fim: {media.schedule_end_date} às {media.schedule_end_time}"))
+            else:
+                lines.append(("", "Fim: Não definido"))
+        else:
+            lines.append(("Agendamento:", "Não agendado"))
+
+        bold_font = QFont(option.font)
+        bold_font.setBold(True)
+        bold_metrics = QFontMetrics(bold_font)
+        metrics = QFontMetrics(option.font)
+        line_height = max(bold_metrics.height(), metrics.height())
+
+        text_color = option.palette.highlightedText() if option.state & QStyle.State_Selected else option.palette.text()
+        painter.setPen(text_color.color())
+        y = rect.top()
+        for label, value in lines:
+            x = rect.left()
+            if label:
+                painter.setFont(bold_font)
+                painter.drawText(QRect(x, y, rect.width(), line_height), Qt.AlignLeft | Qt.AlignVCenter, label)
+                x += bold_metrics.horizontalAdvance(label + " ")
+            if value:
+                painter.setFont(option.font)
+                width = rect.right() - x
+                painter.drawText(QRect(x, y, width, line_height), Qt.AlignLeft | Qt.AlignVCenter,
+                                 metrics.elidedText(value, Qt.ElideRight, width))
+            y += line_height
+
+    # --- Interação ---------------------------------------------------------------
+
+    def editorEvent(self, event, model, option, index):
+        event_type = event.type()
+        if event_type in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease, QEvent.MouseButtonDblClick):
+            if event.button() != Qt.LeftButton:
+                return False
+            position = event.position().toPoint()
+            on_checkbox = self.checkbox_rect(option.rect).contains(position)
+            on_edit = self.edit_button_rect(option.rect).contains(position)
+            if not (on_checkbox or on_edit):
+                return False
+            # Cliques nos controles não devem alterar a seleção da lista
+            if event_type == QEvent.MouseButtonRelease:
+                if on_checkbox:
+                    checked = index.data(Qt.CheckStateRole) == Qt.Checked
+                    model.setData(index, Qt.Unchecked if checked else Qt.Checked, Qt.CheckStateRole)
+                else:
+                    self.edit_requested.emit(index.data(MEDIA_ROLE))
+            return True
+
+        if event_type == QEvent.MouseMove:
+            thumbnail_rect = self.thumbnail_rect(option.rect)
+            position = event.position().toPoint()
+            if index.data(SPRITE_ROLE) is not None and thumbnail_rect.contains(position):
+                self._set_hover(index.row(), (position.x() - thumbnail_rect.left()) / thumbnail_rect.width())
+            else:
+                self._set_hover(None)
+        return False
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Leave:
+            self._set_hover(None)
+        elif event.type() == QEvent.MouseMove and self.hover_row is not None:
+            # editorEvent só é chamado sobre itens; o espaço vazio também encerra o scrub
+            if not self.view.indexAt(event.position().toPoint()).isValid():
+                self._set_hover(None)
+        return super().eventFilter(watched, event)
+
+    def _set_hover(self, row, fraction=0.0):
+        previous_row = self.hover_row
+        self.hover_row = row
+        self.hover_fraction = fraction
+        model = self.view.model()
+        for changed_row in {previous_row, row} - {None}:
+            if model is not None and changed_row < model.rowCount():
+                self.view.update(model.index(changed_row, 0))
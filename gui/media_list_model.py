@@ -0,0 +1,170 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PySide6.QtGui import QPixmap
+from gui.pixmap_cache import PixmapCache
+from utils.media_repository import MEDIA_INSERTED, MEDIA_UPDATED, MEDIA_DELETED
+
+# Papéis extras expostos ao delegate
+MEDIA_ROLE = Qt.UserRole + 1
+SPRITE_ROLE = Qt.UserRole + 2
+
+# Quantidade de mídias lidas do banco a cada fetchMore
+LIBRARY_PAGE_SIZE = 200
+
+
+class MediaListModel(QAbstractListModel):
+    """Modelo da biblioteca: uma linha por MediaRecord, carregada em páginas.
+
+    Cada linha guarda só o registro; miniatura, checkbox e botão de edição são
+    desenhados pelo MediaItemDelegate, então o custo por item é constante.
+    As miniaturas ficam num PixmapCache com limite de bytes: as de linhas que
+    saíram da tela são descartadas e pedidas de novo quando voltarem.
+    """
+
+    def __init__(self, repository, parent=None, pixmap_cache=None):
+        super().__init__(parent)
+        self.repository = repository
+        self.pixmap_cache = pixmap_cache or PixmapCache()
+        self._medias = []
+        self._rows = {}        # media_id -> linha
+        self._checked = set()  # media_ids marcados no checkbox
+        self._no_thumbnail = set()  # media_ids cuja miniatura não pôde ser gerada
+        self._last_loaded_id = 0
+        self._fully_loaded = False
+
+    # --- Leitura -----------------------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._medias)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._medias):
+            return None
+        media = self._medias[index.row()]
+        if role == Qt.DisplayRole:
+            return media.name
+        if role == MEDIA_ROLE:
+            return media
+        if role in (Qt.DecorationRole, SPRITE_ROLE):
+            pixmaps = self.pixmap_cache.get(media.id)
+            if pixmaps is None:
+                return None
+            return pixmaps[0] if role == Qt.DecorationRole else pixmaps[1]
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if media.id in self._checked else Qt.Unchecked
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+        media_id = self._medias[index.row()].id
+        if Qt.CheckState(value) == Qt.Checked:
+            self._checked.add(media_id)
+        else:
+            self._checked.discard(media_id)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+
+    def media_at(self, row):
+        return self._medias[row]
+
+    def row_for_id(self, media_id):
+        return self._rows.get(media_id)
+
+    def checked_media_ids(self):
+        return list(self._checked)
+
+    def needs_thumbnail(self, media_id):
+        """True se a miniatura não está em memória (nunca gerada ou descartada pelo LRU)."""
+        return media_id not in self.pixmap_cache and media_id not in self._no_thumbnail
+
+    # --- Paginação ---------------------------------------------------------------
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._fully_loaded
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Carrega a próxima página da biblioteca (paginação por id)."""
+        if not self.canFetchMore(parent):
+            return
+        page = self.repository.get_medias_page(self._last_loaded_id, LIBRARY_PAGE_SIZE)
+        if len(page) < LIBRARY_PAGE_SIZE:
+            self._fully_loaded = True
+        if page:
+            self._last_loaded_id = page[-1].id
+            self._append(page)
+
+    def reload(self):
+        self.beginResetModel()
+        self._medias = []
+        self._rows = {}
+        self._checked.clear()
+        self._no_thumbnail.clear()
+        self.pixmap_cache.clear()
+        self._last_loaded_id = 0
+        self._fully_loaded = False
+        self.endResetModel()
+
+    def _append(self, medias):
+        first = len(self._medias)
+        self.beginInsertRows(QModelIndex(), first, first + len(medias) - 1)
+        for offset, media in enumerate(medias):
+            self._medias.append(media)
+            self._rows[media.id] = first + offset
+        self.endInsertRows()
+
+    # --- Deltas e miniaturas -------------------------------------------------------
+
+    def apply_media_change(self, change):
+        """Aplica um MediaChange emitido pelo repositório."""
+        if change.kind == MEDIA_INSERTED:
+            # Com páginas ainda por carregar, as novas mídias chegam pelo fetchMore
+            # (têm os maiores ids); adicioná-las agora as duplicaria.
+            if not self._fully_loaded:
+                return
+            new_medias = [media for media in change.records if media.id not in self._rows]
+            if new_medias:
+                self._last_loaded_id = max(self._last_loaded_id, new_medias[-1].id)
+                self._append(new_medias)
+
+        elif change.kind == MEDIA_UPDATED:
+            for media in change.records:
+                row = self._rows.get(media.id)
+                if row is None:
+                    continue
+                self._medias[row] = media
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+        elif change.kind == MEDIA_DELETED:
+            rows = sorted((self._rows[media_id] for media_id in change.media_ids if media_id in self._rows),
+                          reverse=True)
+            for row in rows:
+                media_id = self._medias[row].id
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._medias[row]
+                self.endRemoveRows()
+                self._checked.discard(media_id)
+                self._no_thumbnail.discard(media_id)
+                self.pixmap_cache.remove(media_id)
+            if rows:
+                self._rows = {media.id: row for row, media in enumerate(self._medias)}
+
+    def set_thumbnail(self, media_id, image, sprite=None):
+        """Guarda a miniatura gerada em segundo plano e redesenha a linha."""
+        row = self._rows.get(media_id)
+        if row is None:
+            return
+        if image is None or image.isNull():
+            self._no_thumbnail.add(media_id)
+            return
+        sprite_pixmap = None if sprite is None or sprite.isNull() else QPixmap.fromImage(sprite)
+        self.pixmap_cache.put(media_id, (QPixmap.fromImage(image), sprite_pixmap))
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DecorationRole, SPRITE_ROLE])
@@ -0,0 +1,43 @@
+from utils.memory_cache import MemoryCache
+
+# Orçamento padrão das miniaturas em memória (um sprite de 10 quadros ocupa ~600 KB)
+DEFAULT_PIXMAP_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def pixmap_bytes(pixmap):
+    """Memória aproximada ocupada pelo pixmap (largura x altura x bytes por pixel)."""
+    if pixmap is None or pixmap.isNull():
+        return 0
+    return pixmap.width() * pixmap.height() * max(1, pixmap.depth() // 8)
+
+
+class PixmapCache(MemoryCache):
+    """Cache LRU de pixmaps em memória com limite em bytes.
+
+    Cada entrada guarda uma tupla de pixmaps (ex.: miniatura e sprite) sob uma
+    chave; ao passar do limite, as menos usadas são descartadas. As chaves
+    passadas a `pin()` (o que está na tela) nunca são descartadas, então o que
+    saiu da viewport é sempre o primeiro a ser liberado.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_PIXMAP_CACHE_BYTES):
+        super().__init__(max_bytes)
+        self._pinned = frozenset()
+
+    def pin(self, keys):
+        """Protege `keys` do descarte (substitui as anteriores) e as marca como recém-usadas."""
+        self._pinned = frozenset(keys)
+        for key in keys:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        self._evict()
+
+    def clear(self):
+        super().clear()
+        self._pinned = frozenset()
+
+    def value_bytes(self, pixmaps):
+        return sum(pixmap_bytes(pixmap) for pixmap in pixmaps)
+
+    def eviction_order(self):
+        return [key for key in self._entries if key not in self._pinned]
@@ -0,0 +1,305 @@
+import json
+import os
+import platform
+import sys
+from PySide6 import Shiboken
+from PySide6.QtCore import QObject, QProcess, QTimer, Signal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+from PySide6.QtWidgets import QApplication
+from gui.media_display import MediaDisplayWindow
+from utils.database import DatabaseManager
+from utils.path_helper import get_resource_path
+from utils.schedule_index import ScheduleIndex
+
+# Argumentos de linha de comando do processo do player (`main.py --player --ipc-name <nome>`)
+PLAYER_ARGUMENT = "--player"
+IPC_NAME_ARGUMENT = "--ipc-name"
+# Tempo (ms) que o player tem para encerrar sozinho após o "stop" antes de ser finalizado
+PLAYER_STOP_TIMEOUT_MS = 3000
+# Nome do cursor do player em change_log_cursors
+PLAYER_CHANGE_CONSUMER = "player"
+
+
+def player_command(server_name):
+    """Programa e argumentos que iniciam o player como processo filho.
+
+    No executável (PyInstaller) o próprio executável é chamado com `--player`;
+    em desenvolvimento, o interpretador roda o main.py.
+    """
+    arguments = [PLAYER_ARGUMENT, IPC_NAME_ARGUMENT, server_name]
+    if getattr(sys, "frozen", False):
+        return sys.executable, arguments
+    return sys.executable, [get_resource_path("main.py")] + arguments
+
+
+def read_messages(socket):
+    """Lê as mensagens completas disponíveis no socket (uma linha JSON cada)."""
+    messages = []
+    while socket.canReadLine():
+        line = bytes(socket.readLine()).decode("utf-8").strip()
+        if not line:
+            continue
+        try:
+            messages.append(json.loads(line))
+        except ValueError as e:
+            print(f"Mensagem inválida do canal do player: {e}")
+    return messages
+
+
+def write_message(socket, message):
+    socket.write((json.dumps(message) + "\n").encode("utf-8"))
+    socket.flush()
+
+
+class PlayerProcess(QObject):
+    """Lado do gerenciador: inicia o player num processo separado e o comanda.
+
+    Os comandos (play, stop, mute, reload) vão como linhas JSON por um
+    QLocalSocket. Com o player em outro processo, diálogos, importações e
+    edições no gerenciador não travam a reprodução, e uma falha no player não
+    derruba o gerenciador. `closed` é emitido quando o processo termina, seja
+    pelo fim da programação, por "stop" ou por falha.
+    """
+    closed = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.server_name = f"wl_signage_player_{os.getpid()}"
+        self.server = QLocalServer(self)
+        # Remove o socket que uma execução anterior interrompida possa ter deixado
+        QLocalServer.removeServer(self.server_name)
+        if not self.server.listen(self.server_name):
+            print(f"Erro ao abrir o canal do player: {self.server.errorString()}")
+        self.server.newConnection.connect(self.accept_connection)
+        self.socket = None
+        self._outbox = []  # comandos enviados antes de o player conectar
+        self._killed = False  # encerrado por nós: o fim do processo não é uma falha
+
+        self.process = QProcess(self)
+        # A saída do player (prints de erro) vai para o mesmo console do gerenciador
+        self.process.setProcessChannelMode(QProcess.ForwardedChannels)
+        self.process.finished.connect(self.on_finished)
+        self.process.errorOccurred.connect(self.on_error)
+
+    def is_running(self):
+        return self.process.state() != QProcess.NotRunning
+
+    def start(self, display_mode, screen_name, is_muted):
+        """Inicia o processo do player e pede a reprodução com as configurações informadas."""
+        if self.is_running():
+            self.stop()
+        self._outbox = []
+        self._killed = False
+        self.send("play", display_mode=display_mode, screen=screen_name, muted=is_muted)
+        program, arguments = player_command(self.server_name)
+        # get_data_path usa a pasta atual no Windows: o player precisa achar o mesmo banco
+        self.process.setWorkingDirectory(os.getcwd())
+        self.process.start(program, arguments)
+
+    def stop(self):
+        if not self.is_running():
+            return
+        if self.socket is None:
+            # Ainda não conectou: waitForFinished bloquearia o loop que aceitaria a
+            # conexão, então o "stop" nunca chegaria. Sem reprodução começada, encerra direto.
+            self._killed = True
+            self.process.kill()
+            self.process.waitForFinished()
+            return
+        self.send("stop")
+        if not self.process.waitForFinished(PLAYER_STOP_TIMEOUT_MS):
+            print("Player não respondeu ao comando de parada; finalizando o processo.")
+            self._killed = True
+            self.process.kill()
+            self.process.waitForFinished()
+
+    def set_muted(self, is_muted):
+        self.send("mute", muted=is_muted)
+
+    def reload(self):
+        """Pede ao player que aplique as alterações de mídias gravadas no banco."""
+        self.send("reload")
+
+    def send(self, command, **arguments):
+        message = dict(arguments, command=command)
+        if self.socket is None:
+            self._outbox.append(message)
+            return
+        write_message(self.socket, message)
+
+    def accept_connection(self):
+        socket = self.server.nextPendingConnection()
+        if self.socket is not None or not self.is_running():
+            # Só o processo iniciado por nós conversa com o gerenciador
+            socket.abort()
+            socket.deleteLater()
+            return
+        self.socket = socket
+        self.socket.disconnected.connect(self.on_disconnected)
+        for message in self._outbox:
+            write_message(self.socket, message)
+        self._outbox = []
+
+    def on_disconnected(self):
+        # O player está saindo: até o processo terminar, send() não pode
+        # escrever no socket que será destruído
+        socket = self.sender()
+        if socket is self.socket:
+            self.socket = None
+        socket.deleteLater()
+
+    def on_finished(self, exit_code, exit_status):
+        if exit_status == QProcess.CrashExit and not self._killed:
+            print(f"O processo do player terminou com falha (código {exit_code}).")
+        self.socket = None
+        self._outbox = []
+        self.closed.emit()
+
+    def on_error(self, error):
+        if error == QProcess.FailedToStart:
+            print(f"Erro ao iniciar o player: {self.process.errorString()}")
+            self._outbox = []
+            self.closed.emit()
+
+
+class PlayerController(QObject):
+    """Lado do player: recebe os comandos do gerenciador e controla a MediaDisplayWindow.
+
+    O player lê o banco por conta própria (conexão somente leitura): ao "reload"
+    aplica só as mídias alteradas desde a última leitura, pelo change_log. O
+    processo termina quando a reprodução para ou quando o gerenciador fecha o canal.
+    """
+
+    def __init__(self, server_name, parent=None):
+        super().__init__(parent)
+        self.db_manager = DatabaseManager(read_only=True)
+        self.player_window = None
+        self.change_seq = 0
+        self._quitting = False
+        self.commands = {
+            "play": self.play,
+            "stop": self.stop,
+            "mute": self.set_muted,
+            "reload": self.reload,
+        }
+
+        self.socket = QLocalSocket(self)
+        self.socket.readyRead.connect(self.read_commands)
+        self.socket.disconnected.connect(self.quit)
+        self.socket.errorOccurred.connect(self.on_socket_error)
+        self.socket.connectToServer(server_name)
+
+    def read_commands(self):
+        for message in read_messages(self.socket):
+            handler = self.commands.get(message.pop("command", None))
+            if handler is None:
+                print(f"Comando desconhecido para o player: {message}")
+                continue
+            try:
+                handler(**message)
+            except Exception as e:
+                print(f"Erro ao executar comando do player: {e}")
+
+    def play(self, display_mode="Fullscreen", screen=None, muted=True):
+        # O seq é lido antes do índice: o que mudar no meio é reaplicado no próximo reload
+        self.change_seq = self.db_manager.get_last_change_seq()
+        schedule_index = ScheduleIndex.from_database(self.db_manager)
+        media_list = schedule_index.active_at()
+        if not media_list and schedule_index.next_boundary() is None:
+            print("Nenhuma mídia ativa para exibir.")
+            self.quit()
+            return
+
+        self.player_window = MediaDisplayWindow(
+            media_list,
+            is_muted_at_start=muted,
+            display_mode=display_mode,
+            schedule_index=schedule_index
+        )
+        self.player_window.closed.connect(self.quit)
+        self.show_on_screen(self.find_screen(screen), display_mode)
+        self.player_window.start_playback()
+
+    @staticmethod
+    def find_screen(screen_name):
+        for screen in QApplication.screens():
+            if screen.name() == screen_name:
+                return screen
+        return QApplication.primaryScreen()
+
+    def show_on_screen(self, screen, display_mode):
+        screen_geometry = screen.geometry()
+        if platform.system() == "Windows":
+            # No Windows, vinculamos a tela e movemos para a coordenada absoluta.
+            # Se a Tela 2 começa em X=1920, move(1920, 0) coloca ela lá instantaneamente.
+            self.player_window.setScreen(screen)
+            self.player_window.move(screen_geometry.topLeft())
+
+            if display_mode == "Fullscreen":
+                self.player_window.showFullScreen()
+            else:
+                self.player_window.show()
+        else:
+            # No Linux (Wayland/COSMIC), o SO ignora o move().
+            # Tentamos o setScreen, mas o Linux geralmente decide a tela sozinho.
+            self.player_window.setScreen(screen)
+            self.player_window.setGeometry(screen_geometry)
+
+            if display_mode == "Fullscreen":
+                self.player_window.showFullScreen()
+            else:
+                self.player_window.show()
+
+            # Força o foco no Linux
+            self.player_window.raise_()
+            self.player_window.activateWindow()
+
+    def stop(self):
+        self.quit()
+
+    def set_muted(self, muted):
+        if self.player_window is not None:
+            self.player_window.set_muted(muted)
+
+    def reload(self):
+        if self.player_window is None:
+            return
+        if self.change_seq < self.db_manager.get_pruned_change_seq():
+            # Parte do que mudou desde a última leitura já saiu do log: relê tudo
+            self.resync()
+            return
+        self.change_seq, records, deleted_ids = self.db_manager.get_media_changes_since(self.change_seq)
+        if records or deleted_ids:
+            # Inserções e atualizações entram do mesmo jeito: a mídia é (re)colocada no índice
+            self.player_window.apply_media_changes(records, deleted_ids)
+
+    def resync(self):
+        """Substitui a programação em memória por uma leitura completa do banco."""
+        self.change_seq = self.db_manager.get_last_change_seq()
+        records = self.db_manager.get_unexpired_medias()
+        current_ids = {media.id for media in self.player_window.schedule_index.medias()}
+        deleted_ids = current_ids.difference(media.id for media in records)
+        self.player_window.apply_media_changes(records, sorted(deleted_ids))
+
+    def on_socket_error(self, error):
+        if error != QLocalSocket.PeerClosedError:
+            print(f"Erro no canal com o gerenciador: {self.socket.errorString()}")
+        self.quit()
+
+    def quit(self):
+        if self._quitting:
+            return
+        self._quitting = True
+        if self.player_window is not None and Shiboken.isValid(self.player_window):
+            self.player_window.stop_playback()
+        self.player_window = None
+        self.db_manager.close()
+        # Adiado para o loop de eventos: a falha de conexão é informada ainda no
+        # construtor, antes do app.exec(), quando quit() não teria efeito
+        QTimer.singleShot(0, QApplication.quit)
+
+
+def run_player(app, server_name):
+    """Executa o processo do player até a reprodução terminar."""
+    controller = PlayerController(server_name)
+    return app.exec()
@@ -0,0 +1,185 @@
+import heapq
+import itertools
+import os
+import threading
+from PySide6.QtCore import (QObject, QThreadPool, Signal, Qt,
+                            QBuffer, QByteArray, QIODevice)
+from PySide6.QtGui import QImage, QImageReader
+from gui.video_probe import VideoProbe
+
+# Dimensões padrão para as miniaturas
+THUMBNAIL_WIDTH = 150
+THUMBNAIL_HEIGHT = 100
+VIDEO_THUMBNAIL_FRAME = 5
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif")
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov")
+
+# Prioridades na fila do pool: itens visíveis passam na frente dos demais
+VISIBLE_PRIORITY = 10
+BACKGROUND_PRIORITY = 0
+
+
+def _load_image_thumbnail(file_path):
+    reader = QImageReader(file_path)
+    source_size = reader.size()
+    if source_size.isValid() and (source_size.width() > THUMBNAIL_WIDTH or source_size.height() > THUMBNAIL_HEIGHT):
+        # Pede ao leitor o tamanho final: no JPEG a redução acontece na própria
+        # decodificação (escala DCT), sem nunca montar a imagem em resolução cheia.
+        reader.setScaledSize(source_size.scaled(THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT, Qt.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        return None
+    if image.width() > THUMBNAIL_WIDTH or image.height() > THUMBNAIL_HEIGHT:
+        image = image.scaled(THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return image
+
+
+def _load_video_previews(file_path, frame_count=None, fps=None):
+    """Lê miniatura e sprite sheet de um vídeo abrindo o arquivo uma única vez."""
+    with VideoProbe(file_path, frame_count, fps) as probe:
+        if not probe.is_open():
+            return None, None
+        target_frame = VIDEO_THUMBNAIL_FRAME
+        if target_frame >= probe.frame_count:
+            target_frame = 0
+        thumbnail = probe.read_frame(target_frame, THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT)
+        sprite = probe.read_sprite_sheet(THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT)
+    return thumbnail, sprite
+
+
+def _read_cached(thumbnail_cache, file_path, variant):
+    if thumbnail_cache is None:
+        return None
+    cached_path = thumbnail_cache.get(file_path, THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT, variant)
+    if not cached_path:
+        return None
+    cached_image = QImage(cached_path)
+    return None if cached_image.isNull() else cached_image
+
+
+def _store_cached(thumbnail_cache, file_path, variant, image):
+    if thumbnail_cache is None or image is None:
+        return
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    if image.save(buffer, "PNG"):
+        thumbnail_cache.put(file_path, THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT, data.data(), variant)
+
+
+def generate_thumbnail(file_path, thumbnail_cache=None, frame_count=None, fps=None):
+    """Gera (ou lê do cache) a miniatura de uma mídia e, para vídeos, o sprite sheet.
+
+    Retorna (miniatura, sprite) como QImage; qualquer um pode ser None. Usa apenas
+    QImage e cv2, então pode rodar fora da thread da interface. `frame_count` e
+    `fps` são os metadados gravados na importação, quando existirem.
+    """
+    if not os.path.exists(file_path):
+        return None, None
+
+    file_extension = os.path.splitext(file_path)[1].lower()
+    if file_extension in IMAGE_EXTENSIONS:
+        image = _read_cached(thumbnail_cache, file_path, "thumb")
+        if image is None:
+            image = _load_image_thumbnail(file_path)
+            _store_cached(thumbnail_cache, file_path, "thumb", image)
+        return image, None
+
+    if file_extension in VIDEO_EXTENSIONS:
+        image = _read_cached(thumbnail_cache, file_path, "thumb")
+        sprite = _read_cached(thumbnail_cache, file_path, "sprite")
+        if image is None or sprite is None:
+            image, sprite = _load_video_previews(file_path, frame_count, fps)
+            _store_cached(thumbnail_cache, file_path, "thumb", image)
+            _store_cached(thumbnail_cache, file_path, "sprite", sprite)
+        return image, sprite
+
+    return None, None
+
+
+class ThumbnailLoader(QObject):
+    """Gera miniaturas num QThreadPool e entrega cada uma pelo sinal `thumbnail_ready`.
+
+    Os pedidos ficam numa fila de prioridade consumida pelos workers do pool;
+    `prioritize()` promove os itens visíveis para que a tela se preencha primeiro.
+    """
+    thumbnail_ready = Signal(object, object, object)  # (media_id, miniatura, sprite); QImage ou None
+
+    def __init__(self, thumbnail_cache=None, parent=None):
+        super().__init__(parent)
+        self.thumbnail_cache = thumbnail_cache
+        self.thread_pool = QThreadPool(self)
+        # Deixa um núcleo livre para a interface
+        self.thread_pool.setMaxThreadCount(max(1, QThreadPool.globalInstance().maxThreadCount() - 1))
+
+        self._lock = threading.Lock()
+        self._queue = []      # heap de (-prioridade, ordem de chegada, media_id)
+        self._requests = {}   # media_id -> (prioridade, MediaRecord) ainda não iniciados
+        self._sequence = itertools.count()
+        self._active_workers = 0
+
+    def request(self, media, priority=BACKGROUND_PRIORITY):
+        """Enfileira a geração da miniatura do MediaRecord (ignorado se já estiver na fila)."""
+        with self._lock:
+            if media.id in self._requests:
+                return
+            self._requests[media.id] = (priority, media)
+            heapq.heappush(self._queue, (-priority, next(self._sequence), media.id))
+            self._start_workers()
+
+    def prioritize(self, media_ids, priority=VISIBLE_PRIORITY):
+        """Promove pedidos ainda na fila, na ordem recebida."""
+        with self._lock:
+            for media_id in media_ids:
+                request = self._requests.get(media_id)
+                if request is None or request[0] >= priority:
+                    continue
+                # A entrada antiga do heap fica obsoleta e é ignorada pelos workers
+                self._requests[media_id] = (priority, request[1])
+                heapq.heappush(self._queue, (-priority, next(self._sequence), media_id))
+
+    def cancel(self, media_ids):
+        """Descarta pedidos que ainda não começaram."""
+        with self._lock:
+            for media_id in media_ids:
+                self._requests.pop(media_id, None)
+
+    def shutdown(self):
+        """Esvazia a fila e espera as miniaturas em andamento."""
+        with self._lock:
+            self._requests.clear()
+            self._queue.clear()
+        self.thread_pool.waitForDone()
+
+    def _start_workers(self):
+        # Chamado com o lock: um worker por pedido, até o limite do pool
+        while self._active_workers < min(self.thread_pool.maxThreadCount(), len(self._requests)):
+            self._active_workers += 1
+            self.thread_pool.start(self._work)
+
+    def _next_request(self):
+        with self._lock:
+            while self._queue:
+                negative_priority, _order, media_id = heapq.heappop(self._queue)
+                request = self._requests.get(media_id)
+                if request is not None and request[0] == -negative_priority:
+                    del self._requests[media_id]
+                    return media_id, request[1]
+            self._active_workers -= 1
+            return None
+
+    def _work(self):
+        while True:
+            next_request = self._next_request()
+            if next_request is None:
+                return
+            media_id, media = next_request
+            try:
+                image, sprite = generate_thumbnail(media.file_path, self.thumbnail_cache,
+                                                   media.frame_count, media.fps)
+            except Exception as e:
+                print(f"Erro ao gerar miniatura de {media.file_path}: {e}")
+                image, sprite = None, None
+            # Emitido da thread do pool: a conexão com a interface é enfileirada
+            self.thumbnail_ready.emit(media_id, image, sprite)
@@ -0,0 +1,123 @@
+import cv2
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QPainter
+
+# Quadros por sprite sheet de pré-visualização (hover scrub na biblioteca)
+SPRITE_FRAMES = 10
+
+
+def _frame_to_image(frame, width, height):
+    """Reduz o quadro BGR para caber em width x height e converte para QImage.
+
+    A redução vem antes da conversão de cor, então só o quadro pequeno é
+    convertido e copiado.
+    """
+    frame_height, frame_width = frame.shape[:2]
+    scale = min(width / frame_width, height / frame_height, 1.0)
+    if scale < 1.0:
+        target = (max(1, int(frame_width * scale)), max(1, int(frame_height * scale)))
+        frame = cv2.resize(frame, target, interpolation=cv2.INTER_AREA)
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    h, w, ch = rgb_frame.shape
+    # copy(): o QImage não pode apontar para o buffer do numpy depois do retorno
+    return QImage(rgb_frame.data, w, h, ch * w, QImage.Format_RGB888).copy()
+
+
+class VideoProbe:
+    """Lê quadros reduzidos de um vídeo com uma única abertura do arquivo.
+
+    O quadro da miniatura é alcançado com grab() sequencial (só demux/decodificação,
+    sem conversão nem cópia), evitando o seek por número de quadro, que volta ao
+    keyframe anterior e decodifica tudo de novo. O OpenCV não expõe seek apenas
+    por keyframe; para o sprite as posições são visitadas em ordem crescente,
+    então cada seek custa no máximo um GOP.
+
+    `frame_count` e `fps` gravados na importação podem ser informados para não
+    depender da estimativa do contêiner.
+    """
+
+    def __init__(self, file_path, frame_count=None, fps=None):
+        self.file_path = file_path
+        self.capture = cv2.VideoCapture(file_path)
+        self.frame_count = 0
+        self.fps = 0.0
+        self._position = 0  # próximo quadro que read()/grab() devolverá
+        if self.capture.isOpened():
+            self.frame_count = frame_count or int(self.capture.get(cv2.CAP_PROP_FRAME_COUNT))
+            self.fps = fps or self.capture.get(cv2.CAP_PROP_FPS)
+
+    def is_open(self):
+        return self.capture.isOpened()
+
+    def release(self):
+        self.capture.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def metadata(self):
+        """Metadados do vídeo nas chaves das colunas de `medias` (vazio se não abriu)."""
+        if not self.is_open():
+            return {}
+        fourcc_code = int(self.capture.get(cv2.CAP_PROP_FOURCC))
+        fourcc = "".join(chr((fourcc_code >> (8 * shift)) & 0xFF) for shift in range(4)).strip("\x00 ")
+        return {
+            "width": int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "fps": self.fps,
+            "frame_count": self.frame_count,
+            "fourcc": fourcc or None,
+            "media_duration": self.frame_count / self.fps if self.fps > 0 else None,
+        }
+
+    def read_frame(self, frame_index, width, height):
+        """Retorna o quadro `frame_index` reduzido para width x height (ou None)."""
+        if not self.is_open():
+            return None
+
+        if frame_index < self._position or frame_index - self._position > max(1, int(self.fps)):
+            # Longe demais para avançar quadro a quadro: um seek só
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+            self._position = frame_index
+
+        while self._position < frame_index:
+            if not self.capture.grab():
+                return None
+            self._position += 1
+
+        ret, frame = self.capture.read()
+        if not ret:
+            return None
+        self._position += 1
+        return _frame_to_image(frame, width, height)
+
+    def read_sprite_sheet(self, cell_width, cell_height, frames=SPRITE_FRAMES):
+        """Monta uma faixa horizontal com `frames` quadros distribuídos pelo vídeo.
+
+        Cada célula tem cell_width x cell_height, com o quadro centralizado em fundo
+        preto. Retorna None se nenhum quadro puder ser lido.
+        """
+        if not self.is_open() or self.frame_count <= 0:
+            return None
+
+        sheet = QImage(cell_width * frames, cell_height, QImage.Format_RGB888)
+        sheet.fill(Qt.black)
+        painter = QPainter(sheet)
+        read_any = False
+        try:
+            for cell in range(frames):
+                # Centro de cada fatia do vídeo, evitando o primeiro quadro (geralmente preto)
+                frame_index = int((cell + 0.5) * self.frame_count / frames)
+                image = self.read_frame(min(frame_index, self.frame_count - 1), cell_width, cell_height)
+                if image is None:
+                    continue
+                read_any = True
+                x = cell * cell_width + (cell_width - image.width()) // 2
+                y = (cell_height - image.height()) // 2
+                painter.drawImage(x, y, image)
+        finally:
+            painter.end()
+        return sheet if read_any else None
@@ -3,6 +3,7 @@ from PySide6.QtWidgets import QApplication, QSplashScreen
 from PySide6.QtGui import QPixmap
 from PySide6.QtCore import Qt, QTimer
 from gui.main_window import MainWindow
+from gui.player_process import PLAYER_ARGUMENT, IPC_NAME_ARGUMENT, run_player
 from utils.path_helper import get_resource_path
 import ctypes
 import platform
@@ -14,6 +15,11 @@ if platform.system() == "Windows":
 if __name__ == "__main__":
     app = QApplication(sys.argv)
 
+    if PLAYER_ARGUMENT in sys.argv:
+        # Processo filho do player, comandado pelo gerenciador (ver gui/player_process.py)
+        server_name = sys.argv[sys.argv.index(IPC_NAME_ARGUMENT) + 1]
+        sys.exit(run_player(app, server_name))
+
     splash_path = get_resource_path(os.path.join("data", "assets", "logo.png"))
 
     pixmap = QPixmap(splash_path)
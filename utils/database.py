@@ -1,24 +1,129 @@
 import sqlite3
+import threading
+import time
 from datetime import datetime
+from itertools import starmap
+from pathlib import Path
 import os
 from utils.path_helper import get_data_path
+from utils.media_record import MediaRecord
+
+# Colunas lidas para montar um MediaRecord, na ordem dos seus atributos: o
+# registro é montado pela posição das colunas.
+MEDIA_COLUMNS = ", ".join(MediaRecord.__slots__)
+
+# Metadados do arquivo gravados na importação, para nunca reabrir a mídia só para lê-los.
+MEDIA_METADATA_COLUMNS = {
+    "width": "INTEGER",
+    "height": "INTEGER",
+    "fps": "REAL",
+    "frame_count": "INTEGER",
+    "fourcc": "TEXT",
+    "file_size": "INTEGER",
+    "file_mtime_ns": "INTEGER",
+    "media_duration": "REAL",
+}
+
+# Formato em que a tela de edição grava data/hora do agendamento.
+SCHEDULE_DATETIME_FORMAT = "%d/%m/%Y %H:%M"
+
+# Limites usados quando a mídia não tem início/fim definidos. Mantendo as colunas
+# sem NULL, o filtro de período vira um simples intervalo e pode usar o índice.
+SCHEDULE_OPEN_START = 0
+SCHEDULE_OPEN_END = 253402300799  # 31/12/9999 23:59:59 UTC
+
+
+def schedule_to_epoch(date_text, time_text):
+    """Converte o par (dd/MM/yyyy, HH:mm) gravado pela interface em epoch (segundos).
+
+    Retorna None se a data estiver vazia ou em formato inválido.
+    """
+    if not date_text:
+        return None
+    try:
+        dt = datetime.strptime(f"{date_text} {time_text or '00:00'}", SCHEDULE_DATETIME_FORMAT)
+    except ValueError:
+        return None
+    return int(dt.timestamp())
+
+
+def schedule_bounds(start_date, start_time, end_date, end_time):
+    """Retorna (start_ts, end_ts) prontos para as colunas indexadas de agendamento."""
+    start_ts = schedule_to_epoch(start_date, start_time)
+    end_ts = schedule_to_epoch(end_date, end_time)
+    return (
+        SCHEDULE_OPEN_START if start_ts is None else start_ts,
+        SCHEDULE_OPEN_END if end_ts is None else end_ts,
+    )
+
+# Tabelas cujas alterações ficam registradas no change_log (via triggers).
+CHANGE_LOG_TABLES = ("medias",)
+
+# Maior quantidade de parâmetros usada num único IN (...).
+MAX_SQL_PARAMS = 900
+
+# Tempo que uma conexão espera por um lock de escrita antes de falhar.
+BUSY_TIMEOUT_MS = 5000
 
 class DatabaseManager:
-    def __init__(self, db_name=None):
+    """Acesso ao banco SQLite com uma conexão por thread.
+
+    O banco roda em modo WAL: leitores (player, interface) não bloqueiam o escritor
+    e vice-versa. Cada thread que usa o gerenciador recebe sua própria conexão,
+    criada sob demanda; `read_only=True` abre conexões somente leitura (player).
+    """
+
+    def __init__(self, db_name=None, read_only=False):
         if db_name is None:
             self.db_name = get_data_path(os.path.join("digital_signage.db"))
         else:
             self.db_name = db_name
 
-        self.conn = None
-        self.cursor = None
+        self.read_only = read_only
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
         self.connect()
-        self.setup_database()
+        if not self.read_only:
+            self.setup_database()
+
+    @property
+    def conn(self):
+        """Conexão da thread atual (criada na primeira utilização)."""
+        return self.connect()
+
+    @property
+    def cursor(self):
+        """Cursor da conexão da thread atual."""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self._local.cursor = self.connect().cursor()
+        return cursor
 
     def connect(self):
-        """Estabelece a conexão com o banco de dados."""
-        self.conn = sqlite3.connect(self.db_name)
-        self.cursor = self.conn.cursor()
+        """Estabelece (ou reaproveita) a conexão da thread atual com o banco de dados."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        if self.read_only:
+            uri = Path(os.path.abspath(self.db_name)).as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            conn = sqlite3.connect(self.db_name, check_same_thread=False)
+            # WAL é persistente no arquivo; basta a conexão de escrita ativá-lo.
+            conn.execute("PRAGMA journal_mode = WAL")
+            # Em WAL, NORMAL só faz fsync nos checkpoints e continua seguro contra corrupção.
+            conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+
+        self._local.conn = conn
+        self._local.cursor = None
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
 
     def setup_database(self):
         """Cria a tabela de mídias se ela não existir, com a nova coluna de duração."""
@@ -32,25 +137,319 @@ class DatabaseManager:
                 schedule_start_date TEXT,
                 schedule_start_time TEXT,
                 schedule_end_date TEXT,
-                schedule_end_time TEXT
+                schedule_end_time TEXT,
+                schedule_start_ts INTEGER NOT NULL DEFAULT 0,
+                schedule_end_ts INTEGER NOT NULL DEFAULT 253402300799,
+                content_hash TEXT,
+                width INTEGER,
+                height INTEGER,
+                fps REAL,
+                frame_count INTEGER,
+                fourcc TEXT,
+                file_size INTEGER,
+                file_mtime_ns INTEGER,
+                media_duration REAL
             )
         ''')
+        self._migrate_schedule_columns()
+        self._migrate_content_hash_column()
+        self._migrate_metadata_columns()
+        # Nenhuma consulta filtra mais pelo início do período: o índice antigo
+        # (início, fim) só custava escrita a cada inserção e reagendamento
+        self.cursor.execute("DROP INDEX IF EXISTS idx_medias_schedule")
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_medias_schedule_end ON medias (schedule_end_ts)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_medias_content_hash ON medias (content_hash)"
+        )
+        self._setup_change_log()
         self.conn.commit()
 
-    def add_media(self, name, media_type, file_path, duration_seconds=None):
-        """Adiciona uma nova mídia ao banco de dados."""
+    def _setup_change_log(self):
+        """Cria o log de alterações (só inserção) e os triggers que o alimentam.
+
+        Cada alteração numa tabela de CHANGE_LOG_TABLES vira uma linha com `seq`
+        crescente; consumidores (player, backup, sincronização) pedem "o que mudou
+        desde N" em vez de comparar a tabela inteira, e guardam em
+        change_log_cursors até onde já leram.
+        """
         self.cursor.execute('''
-            INSERT INTO medias (name, type, file_path, duration_seconds, schedule_start_date, schedule_start_time, schedule_end_date, schedule_end_time)
-            VALUES (?, ?, ?, ?, NULL, NULL, NULL, NULL)
-        ''', (name, media_type, file_path, duration_seconds))
-        self.conn.commit()
-        return self.cursor.lastrowid
+            CREATE TABLE IF NOT EXISTS change_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_name TEXT NOT NULL,
+                row_id INTEGER NOT NULL,
+                operation TEXT NOT NULL,
+                changed_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+            )
+        ''')
+        for table in CHANGE_LOG_TABLES:
+            for operation, event, row in (("insert", "INSERT", "NEW"),
+                                          ("update", "UPDATE", "NEW"),
+                                          ("delete", "DELETE", "OLD")):
+                self.cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS trg_{table}_{operation}_log
+                    AFTER {event} ON {table}
+                    BEGIN
+                        INSERT INTO change_log (table_name, row_id, operation)
+                        VALUES ('{table}', {row}.rowid, '{operation}');
+                    END
+                ''')
+        # Até onde cada consumidor já leu o log; a limpeza nunca passa do menor
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS change_log_cursors (
+                consumer TEXT PRIMARY KEY,
+                seq INTEGER NOT NULL
+            )
+        ''')
+
+    def _migrate_schedule_columns(self):
+        """Adiciona as colunas epoch em bancos antigos e preenche a partir do texto."""
+        self.cursor.execute("PRAGMA table_info(medias)")
+        columns = {row[1] for row in self.cursor.fetchall()}
+        if "schedule_start_ts" in columns and "schedule_end_ts" in columns:
+            return
+
+        if "schedule_start_ts" not in columns:
+            self.cursor.execute(
+                f"ALTER TABLE medias ADD COLUMN schedule_start_ts INTEGER NOT NULL DEFAULT {SCHEDULE_OPEN_START}"
+            )
+        if "schedule_end_ts" not in columns:
+            self.cursor.execute(
+                f"ALTER TABLE medias ADD COLUMN schedule_end_ts INTEGER NOT NULL DEFAULT {SCHEDULE_OPEN_END}"
+            )
+
+        self.cursor.execute('''
+            SELECT id, schedule_start_date, schedule_start_time, schedule_end_date, schedule_end_time
+            FROM medias
+            WHERE schedule_start_date IS NOT NULL OR schedule_end_date IS NOT NULL
+        ''')
+        updates = [
+            (*schedule_bounds(s_date, s_time, e_date, e_time), media_id)
+            for media_id, s_date, s_time, e_date, e_time in self.cursor.fetchall()
+        ]
+        self.cursor.executemany(
+            "UPDATE medias SET schedule_start_ts = ?, schedule_end_ts = ? WHERE id = ?",
+            updates
+        )
+
+    def _migrate_content_hash_column(self):
+        """Adiciona a coluna do hash do conteúdo em bancos antigos (NULL: arquivo fora do acervo)."""
+        self.cursor.execute("PRAGMA table_info(medias)")
+        columns = {row[1] for row in self.cursor.fetchall()}
+        if "content_hash" not in columns:
+            self.cursor.execute("ALTER TABLE medias ADD COLUMN content_hash TEXT")
+
+    def _migrate_metadata_columns(self):
+        """Adiciona as colunas de metadados em bancos antigos (ficam NULL nas mídias já existentes)."""
+        self.cursor.execute("PRAGMA table_info(medias)")
+        columns = {row[1] for row in self.cursor.fetchall()}
+        for column, column_type in MEDIA_METADATA_COLUMNS.items():
+            if column not in columns:
+                self.cursor.execute(f"ALTER TABLE medias ADD COLUMN {column} {column_type}")
+
+    def add_medias(self, medias):
+        """Adiciona várias mídias numa única transação.
+
+        `medias` é uma lista de (name, media_type, file_path, duration_seconds[, content_hash[, metadata]]),
+        onde `metadata` é um dicionário com chaves de MEDIA_METADATA_COLUMNS (as ausentes ficam NULL).
+        Retorna os IDs criados, na mesma ordem da entrada.
+        """
+        rows = []
+        for media in medias:
+            name, media_type, file_path, duration_seconds, content_hash, metadata = \
+                tuple(media) + (None,) * (6 - len(media))
+            metadata = metadata or {}
+            rows.append((name, media_type, file_path, duration_seconds, content_hash,
+                         *(metadata.get(column) for column in MEDIA_METADATA_COLUMNS)))
+        if not rows:
+            return []
+        metadata_columns = ", ".join(MEDIA_METADATA_COLUMNS)
+        metadata_placeholders = ", ".join("?" * len(MEDIA_METADATA_COLUMNS))
+        with self.conn:
+            self.cursor.executemany(f'''
+                INSERT INTO medias (name, type, file_path, duration_seconds, schedule_start_date, schedule_start_time, schedule_end_date, schedule_end_time, content_hash, {metadata_columns})
+                VALUES (?, ?, ?, ?, NULL, NULL, NULL, NULL, ?, {metadata_placeholders})
+            ''', rows)
+            # A transação segura o lock de escrita, então os rowids são consecutivos.
+            last_id = self.cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+
+    def _fetch_medias(self, query, params=()):
+        """Executa uma consulta sobre `medias` e retorna a lista de MediaRecord."""
+        cursor = self.conn.cursor()
+        cursor.execute(query, params)
+        # Tuplas simples e um construtor posicional: o mais barato por linha
+        return list(starmap(MediaRecord, cursor.fetchall()))
+
+    def get_unexpired_medias(self, now=None):
+        """Retorna as mídias cujo período ainda não terminou (ativas agora ou futuras).
 
-    def get_all_medias(self):
-        """Retorna todos os registros de mídias do banco de dados."""
-        self.cursor.execute('SELECT * FROM medias')
+        Usa o índice do fim do período, então as expiradas nem são lidas. Sem
+        ORDER BY: quem usa (o ScheduleIndex) ordena pelo id.
+        """
+        if now is None:
+            now = int(time.time())
+        return self._fetch_medias(
+            f'SELECT {MEDIA_COLUMNS} FROM medias WHERE schedule_end_ts > ?', (now,)
+        )
+
+    def get_medias_page(self, after_id=0, limit=200):
+        """Retorna até `limit` mídias com id maior que `after_id` (paginação por chave).
+
+        Usa a chave primária como cursor, então o custo de cada página não depende
+        de quantas páginas já foram lidas nem do tamanho da tabela.
+        """
+        return self._fetch_medias(
+            f'SELECT {MEDIA_COLUMNS} FROM medias WHERE id > ? ORDER BY id LIMIT ?',
+            (after_id, limit)
+        )
+
+    def get_last_change_seq(self):
+        """Retorna o seq da alteração mais recente (0 se nunca houve alteração).
+
+        Vem do contador do AUTOINCREMENT, que não volta mesmo com o log limpo.
+        """
+        self.cursor.execute(
+            "SELECT COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'change_log'), 0)"
+        )
+        return self.cursor.fetchone()[0]
+
+    def get_changes_since(self, seq, limit=1000, table_name=None):
+        """Retorna até `limit` entradas do log com seq maior que `seq`.
+
+        Cada entrada é (seq, table_name, row_id, operation, changed_at), em ordem de seq.
+        """
+        if table_name is None:
+            self.cursor.execute('''
+                SELECT seq, table_name, row_id, operation, changed_at
+                FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?
+            ''', (seq, limit))
+        else:
+            self.cursor.execute('''
+                SELECT seq, table_name, row_id, operation, changed_at
+                FROM change_log WHERE seq > ? AND table_name = ? ORDER BY seq LIMIT ?
+            ''', (seq, table_name, limit))
         return self.cursor.fetchall()
 
+    def get_media_changes_since(self, seq):
+        """Resume as alterações em `medias` desde `seq`.
+
+        Retorna (último seq lido, MediaRecords inseridos/alterados, ids removidos),
+        já consolidando várias alterações da mesma mídia. O custo depende do
+        volume de alterações, não do tamanho da biblioteca.
+        """
+        last_seq = seq
+        last_operation = {}
+        while True:
+            entries = self.get_changes_since(last_seq, table_name="medias")
+            if not entries:
+                break
+            for entry_seq, _table, row_id, operation, _changed_at in entries:
+                last_operation[row_id] = operation
+            last_seq = entries[-1][0]
+
+        deleted_ids = [row_id for row_id, operation in last_operation.items() if operation == "delete"]
+        changed_ids = [row_id for row_id, operation in last_operation.items() if operation != "delete"]
+
+        records = []
+        for start in range(0, len(changed_ids), MAX_SQL_PARAMS):
+            chunk = changed_ids[start:start + MAX_SQL_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+            records.extend(self._fetch_medias(
+                f'SELECT {MEDIA_COLUMNS} FROM medias WHERE id IN ({placeholders}) ORDER BY id', chunk
+            ))
+        # Uma mídia alterada e removida depois do último seq lido simplesmente não volta na consulta
+        found_ids = {media.id for media in records}
+        deleted_ids.extend(row_id for row_id in changed_ids if row_id not in found_ids)
+        return last_seq, records, sorted(deleted_ids)
+
+    def get_pruned_change_seq(self):
+        """Retorna o maior seq já removido do log (0 se nada foi removido).
+
+        Um consumidor com cursor abaixo desse valor perdeu alterações e precisa
+        reler tudo em vez de continuar pelo log.
+        """
+        self.cursor.execute('''
+            SELECT COALESCE(
+                (SELECT MIN(seq) FROM change_log) - 1,
+                (SELECT seq FROM sqlite_sequence WHERE name = 'change_log'),
+                0
+            )
+        ''')
+        return self.cursor.fetchone()[0]
+
+    def get_change_cursor(self, consumer):
+        """Retorna o seq até onde `consumer` já leu o log (None se não estiver registrado)."""
+        self.cursor.execute("SELECT seq FROM change_log_cursors WHERE consumer = ?", (consumer,))
+        row = self.cursor.fetchone()
+        return None if row is None else row[0]
+
+    def set_change_cursor(self, consumer, seq):
+        """Registra que `consumer` já leu o log até `seq` (cria o cursor se preciso)."""
+        self.cursor.execute('''
+            INSERT INTO change_log_cursors (consumer, seq) VALUES (?, ?)
+            ON CONFLICT(consumer) DO UPDATE SET seq = excluded.seq
+        ''', (consumer, seq))
+        self.conn.commit()
+
+    def remove_change_cursor(self, consumer):
+        """Remove o cursor de um consumidor que deixou de ler o log."""
+        self.cursor.execute("DELETE FROM change_log_cursors WHERE consumer = ?", (consumer,))
+        self.conn.commit()
+
+    def prune_change_log(self, up_to_seq):
+        """Remove do log as entradas com seq <= `up_to_seq` já lidas por todos os consumidores.
+
+        O limite nunca passa do menor cursor de change_log_cursors; sem cursores,
+        nada é removido. O seq continua crescendo (AUTOINCREMENT), então quem
+        ficar para trás percebe a lacuna por get_pruned_change_seq().
+        """
+        self.cursor.execute('''
+            DELETE FROM change_log
+            WHERE seq <= MIN(?, (SELECT COALESCE(MIN(seq), 0) FROM change_log_cursors))
+        ''', (up_to_seq,))
+        self.conn.commit()
+
+    def find_stored_file(self, content_hash):
+        """(caminho, file_size, file_mtime_ns) do blob já importado com esse hash, ou None.
+
+        Tamanho e mtime vêm da importação mais recente, feita depois da última
+        vez que o blob foi (re)gravado.
+        """
+        self.cursor.execute(
+            "SELECT file_path, file_size, file_mtime_ns FROM medias "
+            "WHERE content_hash = ? ORDER BY id DESC LIMIT 1", (content_hash,)
+        )
+        return self.cursor.fetchone()
+
+    def get_stored_files(self, media_ids):
+        """Retorna {content_hash: file_path} das mídias informadas que estão no acervo."""
+        stored_files = {}
+        media_ids = list(media_ids)
+        for start in range(0, len(media_ids), MAX_SQL_PARAMS):
+            chunk = media_ids[start:start + MAX_SQL_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+            self.cursor.execute(
+                f"SELECT content_hash, file_path FROM medias "
+                f"WHERE id IN ({placeholders}) AND content_hash IS NOT NULL", chunk
+            )
+            stored_files.update(self.cursor.fetchall())
+        return stored_files
+
+    def get_referenced_hashes(self, content_hashes):
+        """Dos hashes informados, retorna os que ainda têm alguma mídia apontando para eles."""
+        referenced = set()
+        content_hashes = list(content_hashes)
+        for start in range(0, len(content_hashes), MAX_SQL_PARAMS):
+            chunk = content_hashes[start:start + MAX_SQL_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+            self.cursor.execute(
+                f"SELECT DISTINCT content_hash FROM medias WHERE content_hash IN ({placeholders})", chunk
+            )
+            referenced.update(row[0] for row in self.cursor.fetchall())
+        return referenced
+
     def delete_medias(self, media_ids):
         """Deleta mídias do banco de dados com base em seus IDs."""
         if not media_ids:
@@ -59,67 +458,75 @@ class DatabaseManager:
         self.cursor.execute(f"DELETE FROM medias WHERE id IN ({placeholders})", media_ids)
         self.conn.commit()
 
-    def update_media_schedule(self, media_id, start_date, start_time, end_date, end_time):
-        """Atualiza o agendamento de uma mídia no banco de dados."""
-        self.cursor.execute('''
-            UPDATE medias
-            SET schedule_start_date = ?,
-                schedule_start_time = ?,
-                schedule_end_date = ?,
-                schedule_end_time = ?
-            WHERE id = ?
-        ''', (start_date, start_time, end_date, end_time, media_id))
-        self.conn.commit()
+    def apply_media_updates(self, updates):
+        """Aplica um lote de atualizações numa única transação.
+
+        `updates` mapeia media_id para um dicionário com as chaves opcionais
+        "schedule" (start_date, start_time, end_date, end_time) e "duration".
+        """
+        # Um único UPDATE por mídia: cada UPDATE gera uma entrada no change_log
+        schedules = []
+        durations = []
+        both = []
+        for media_id, fields in updates.items():
+            if "schedule" in fields:
+                start_date, start_time, end_date, end_time = fields["schedule"]
+                start_ts, end_ts = schedule_bounds(start_date, start_time, end_date, end_time)
+                schedule = (start_date, start_time, end_date, end_time, start_ts, end_ts)
+                if "duration" in fields:
+                    both.append((*schedule, fields["duration"], media_id))
+                else:
+                    schedules.append((*schedule, media_id))
+            elif "duration" in fields:
+                durations.append((fields["duration"], media_id))
+
+        with self.conn:
+            if both:
+                self.cursor.executemany('''
+                    UPDATE medias
+                    SET schedule_start_date = ?,
+                        schedule_start_time = ?,
+                        schedule_end_date = ?,
+                        schedule_end_time = ?,
+                        schedule_start_ts = ?,
+                        schedule_end_ts = ?,
+                        duration_seconds = ?
+                    WHERE id = ?
+                ''', both)
+            if schedules:
+                self.cursor.executemany('''
+                    UPDATE medias
+                    SET schedule_start_date = ?,
+                        schedule_start_time = ?,
+                        schedule_end_date = ?,
+                        schedule_end_time = ?,
+                        schedule_start_ts = ?,
+                        schedule_end_ts = ?
+                    WHERE id = ?
+                ''', schedules)
+            if durations:
+                self.cursor.executemany('''
+                    UPDATE medias
+                    SET duration_seconds = ?
+                    WHERE id = ?
+                ''', durations)
+
+    def close_thread_connection(self):
+        """Fecha a conexão da thread atual (para threads de trabalho que vão terminar)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        with self._connections_lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+        self._local.conn = None
+        self._local.cursor = None
 
-    def update_media_duration(self, media_id, duration_seconds):
-        """Atualiza a duração de uma mídia no banco de dados."""
-        self.cursor.execute('''
-            UPDATE medias
-            SET duration_seconds = ?
-            WHERE id = ?
-        ''', (duration_seconds, media_id))
-        self.conn.commit()
-    
     def close(self):
-        """Fecha a conexão com o banco de dados."""
-        self.conn.close()
-
-    def get_active_medias(self):
-        """Retorna apenas as mídias que estão dentro do período de validade."""
-        self.cursor.execute('SELECT * FROM medias')
-        all_medias = self.cursor.fetchall()
-        
-        active_medias = []
-        now = datetime.now()
-
-        for media in all_medias:
-            # Índices: 5=start_date, 6=start_time, 7=end_date, 8=end_time
-            s_date, s_time = media[5], media[6]
-            e_date, e_time = media[7], media[8]
-
-            # Se não tem início definido, consideramos ativa (ou ajuste conforme sua regra)
-            if not s_date:
-                active_medias.append(media)
-                continue
-
-            try:
-                # Converte strings para objetos datetime
-                start_dt = datetime.strptime(f"{s_date} {s_time}", "%dd/%mm/%YYYY %HH:%MM")
-                
-                # Verifica se já começou
-                if now < start_dt:
-                    continue
-
-                # Verifica se tem fim e se já expirou
-                if e_date:
-                    end_dt = datetime.strptime(f"{e_date} {e_time}", "%dd/%mm/%YYYY %HH:%MM")
-                    if now > end_dt:
-                        continue
-                
-                active_medias.append(media)
-            except Exception as e:
-                print(f"Erro ao processar data da mídia {media[0]}: {e}")
-                # Na dúvida, se o formato estiver errado, podemos manter ou pular
-                active_medias.append(media) 
-
-        return active_medias
\ No newline at end of file
+        """Fecha todas as conexões abertas pelo gerenciador."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
@@ -0,0 +1,75 @@
+class MediaRecord:
+    """Registro de uma mídia, com atributos nomeados no lugar dos índices da tupla.
+
+    Usa `__slots__` para não carregar um `__dict__` por instância: com bibliotecas
+    de 100k itens a diferença de memória é grande (veja benchmarks/media_record_memory.py).
+    """
+    __slots__ = (
+        "id",
+        "name",
+        "type",
+        "file_path",
+        "duration_seconds",
+        "schedule_start_date",
+        "schedule_start_time",
+        "schedule_end_date",
+        "schedule_end_time",
+        "schedule_start_ts",
+        "schedule_end_ts",
+        # Metadados lidos uma vez na importação (None em mídias antigas ou não lidas)
+        "width",
+        "height",
+        "fps",
+        "frame_count",
+        "fourcc",
+        "file_size",
+        "file_mtime_ns",
+        "media_duration",
+    )
+
+    def __init__(self, id, name, type, file_path, duration_seconds=None,
+                 schedule_start_date=None, schedule_start_time=None,
+                 schedule_end_date=None, schedule_end_time=None,
+                 schedule_start_ts=None, schedule_end_ts=None,
+                 width=None, height=None, fps=None, frame_count=None, fourcc=None,
+                 file_size=None, file_mtime_ns=None, media_duration=None):
+        self.id = id
+        self.name = name
+        self.type = type
+        self.file_path = file_path
+        self.duration_seconds = duration_seconds
+        self.schedule_start_date = schedule_start_date
+        self.schedule_start_time = schedule_start_time
+        self.schedule_end_date = schedule_end_date
+        self.schedule_end_time = schedule_end_time
+        self.schedule_start_ts = schedule_start_ts
+        self.schedule_end_ts = schedule_end_ts
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frame_count = frame_count
+        self.fourcc = fourcc
+        self.file_size = file_size
+        self.file_mtime_ns = file_mtime_ns
+        self.media_duration = media_duration  # duração real do vídeo, em segundos
+
+    @property
+    def scheduled_data(self):
+        """Agendamento no formato de dicionário usado pelos diálogos."""
+        return {
+            'start_date': self.schedule_start_date,
+            'start_time': self.schedule_start_time,
+            'end_date': self.schedule_end_date,
+            'end_time': self.schedule_end_time
+        }
+
+    def __eq__(self, other):
+        if not isinstance(other, MediaRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"MediaRecord(id={self.id!r}, name={self.name!r}, type={self.type!r})"
+
@@ -0,0 +1,97 @@
+from PySide6.QtCore import QObject, Signal
+from utils.database import SCHEDULE_OPEN_START, SCHEDULE_OPEN_END, schedule_bounds
+from utils.media_record import MediaRecord
+
+MEDIA_INSERTED = "insert"
+MEDIA_UPDATED = "update"
+MEDIA_DELETED = "delete"
+
+
+class MediaChange:
+    """Delta emitido a cada alteração na tabela de mídias.
+
+    `records` traz os MediaRecord inseridos/atualizados; `media_ids` traz os IDs
+    afetados (em remoções é a única informação disponível).
+    """
+    __slots__ = ("kind", "records", "media_ids")
+
+    def __init__(self, kind, records=(), media_ids=None):
+        self.kind = kind
+        self.records = list(records)
+        self.media_ids = list(media_ids) if media_ids is not None else [media.id for media in self.records]
+
+    def __repr__(self):
+        return f"MediaChange(kind={self.kind!r}, media_ids={self.media_ids!r})"
+
+
+class MediaRepository(QObject):
+    """Camada fina sobre o DatabaseManager que avisa a interface de cada mudança.
+
+    Toda alteração de mídias passa por aqui e gera um MediaChange no sinal
+    `media_changed`; a biblioteca e o player aplicam só o delta, sem recarregar tudo.
+    """
+    media_changed = Signal(object)
+
+    def __init__(self, db_manager, write_queue, parent=None, media_store=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.write_queue = write_queue
+        # Acervo de arquivos importados: blobs sem referência são apagados nas remoções
+        self.media_store = media_store
+
+    def get_medias_page(self, after_id=0, limit=200):
+        return self.db_manager.get_medias_page(after_id, limit)
+
+    def add_medias(self, medias):
+        """Insere um lote de (name, media_type, file_path, duration_seconds[, content_hash[, metadata]]).
+
+        Emite um delta de inserção com os MediaRecord criados (já com os metadados).
+        """
+        medias = list(medias)
+        media_ids = self.db_manager.add_medias(medias)
+        records = []
+        for media_id, media in zip(media_ids, medias):
+            name, media_type, path, duration = media[:4]
+            metadata = media[5] if len(media) > 5 and media[5] else {}
+            records.append(MediaRecord(media_id, name, media_type, path, duration,
+                                       schedule_start_ts=SCHEDULE_OPEN_START,
+                                       schedule_end_ts=SCHEDULE_OPEN_END, **metadata))
+        if records:
+            self.media_changed.emit(MediaChange(MEDIA_INSERTED, records))
+        return records
+
+    def update_media(self, media, schedule=None, duration_seconds=None):
+        """Atualiza agendamento e/ou duração de uma mídia.
+
+        O registro é alterado na hora e o delta emitido; a gravação em disco fica
+        com a fila de escrita.
+        """
+        if schedule is not None:
+            start_date, start_time, end_date, end_time = schedule
+            self.write_queue.update_media_schedule(media.id, start_date, start_time, end_date, end_time)
+            media.schedule_start_date = start_date
+            media.schedule_start_time = start_time
+            media.schedule_end_date = end_date
+            media.schedule_end_time = end_time
+            media.schedule_start_ts, media.schedule_end_ts = schedule_bounds(*schedule)
+
+        if duration_seconds is not None:
+            self.write_queue.update_media_duration(media.id, duration_seconds)
+            media.duration_seconds = duration_seconds
+
+        self.media_changed.emit(MediaChange(MEDIA_UPDATED, [media]))
+
+    def delete_medias(self, media_ids):
+        """Remove mídias, apaga os blobs que ficaram sem referência e emite um delta de remoção."""
+        media_ids = list(media_ids)
+        if not media_ids:
+            return
+        self.write_queue.discard(media_ids)
+        stored_files = self.db_manager.get_stored_files(media_ids) if self.media_store else {}
+        self.db_manager.delete_medias(media_ids)
+        if stored_files:
+            # O mesmo conteúdo pode ser usado por outras mídias: só sai o que ninguém mais usa
+            referenced = self.db_manager.get_referenced_hashes(stored_files)
+            self.media_store.remove(path for content_hash, path in stored_files.items()
+                                    if content_hash not in referenced)
+        self.media_changed.emit(MediaChange(MEDIA_DELETED, media_ids=media_ids))
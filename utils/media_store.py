@@ -0,0 +1,153 @@
+import errno
+import hashlib
+import os
+import shutil
+import threading
+from utils.path_helper import get_data_path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Tamanho do buffer reaproveitado na leitura para o hash
+HASH_CHUNK_SIZE = 1024 * 1024
+# ioctl do Linux que clona um arquivo por referência (btrfs, XFS, bcachefs...)
+FICLONE = 0x40049409
+
+
+def _reflink(source_path, target_path):
+    """Cria `target_path` compartilhando os blocos de `source_path` (copy-on-write)."""
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "reflink indisponível nesta plataforma")
+    with open(source_path, "rb") as source_file, open(target_path, "wb") as target_file:
+        fcntl.ioctl(target_file.fileno(), FICLONE, source_file.fileno())
+
+
+def _copy(source_path, target_path):
+    # copyfile já copia em blocos e usa sendfile/fcopyfile quando o sistema oferece
+    shutil.copyfile(source_path, target_path)
+
+
+# Do mais barato ao mais caro: clone e hard link não copiam dados
+_STORE_METHODS = (("reflink", _reflink), ("hardlink", os.link), ("copy", _copy))
+
+
+def hash_file(file_path):
+    """SHA-256 do arquivo, lido em blocos num único buffer (memória constante)."""
+    digest = hashlib.sha256()
+    buffer = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as source_file:
+        while True:
+            read = source_file.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+    return digest.hexdigest()
+
+
+class MediaStore:
+    """Pasta `media_files`, onde cada arquivo importado é guardado pelo hash do conteúdo.
+
+    O nome de cada blob é `<sha256><extensão>`: importar o mesmo conteúdo de
+    novo (mesmo de outro lugar ou com outro nome) resolve para o mesmo arquivo,
+    referenciado por várias linhas de `medias`. Blobs sem referência são
+    removidos com `remove()`; arquivos fora da pasta nunca são tocados.
+
+    Na mesma partição o blob é um reflink (cópia por referência) ou, sem
+    suporte a isso, um hard link para o original, e só em último caso uma
+    cópia: importar dezenas de GB leva segundos. Com hard link, blob e original
+    são o mesmo arquivo; apagar um não afeta o outro, mas editar o original no
+    lugar altera o blob.
+    """
+
+    def __init__(self, root=None):
+        self.root = os.path.abspath(root or get_data_path("media_files"))
+        os.makedirs(self.root, exist_ok=True)
+
+    def path_for(self, content_hash, extension):
+        return os.path.join(self.root, content_hash + extension.lower())
+
+    def contains(self, file_path):
+        """True se `file_path` é um blob desta pasta."""
+        return os.path.dirname(os.path.abspath(file_path)) == self.root
+
+    def store(self, source_path, content_hash):
+        """Cria o blob do hash a partir de `source_path`, se ainda não existir.
+
+        Tenta reflink, hard link e cópia, nessa ordem. Não faz fsync: chame
+        `sync()` para um lote de blobs antes de gravá-los no banco.
+        Retorna (caminho do blob, True se o arquivo foi criado agora).
+        """
+        stored_path = self.path_for(content_hash, os.path.splitext(source_path)[1])
+        if os.path.exists(stored_path):
+            return stored_path, False
+        self.replace(source_path, stored_path)
+        return stored_path, True
+
+    def replace(self, source_path, stored_path):
+        """Grava `stored_path` de novo a partir de `source_path`, mesmo que já exista.
+
+        Usado quando o blob deixou de ter o conteúdo do hash (ex.: hard link cujo
+        original foi editado no lugar). A troca é atômica; quem estiver com o
+        arquivo antigo aberto continua lendo o antigo.
+        """
+        # Nome temporário por thread: duas importações do mesmo conteúdo não colidem
+        temp_path = f"{stored_path}.{threading.get_ident()}.tmp"
+        for method_name, method in _STORE_METHODS:
+            try:
+                method(source_path, temp_path)
+                break
+            except OSError:
+                # Outra partição, sistema sem suporte, etc.: tenta o próximo método
+                self._remove_file(temp_path)
+                if method_name == "copy":
+                    raise
+            except BaseException:
+                self._remove_file(temp_path)
+                raise
+        try:
+            os.replace(temp_path, stored_path)
+        except BaseException:
+            self._remove_file(temp_path)
+            raise
+
+    def sync(self, file_paths):
+        """Faz fsync dos blobs informados e, uma vez só, da pasta do acervo."""
+        file_paths = list(file_paths)
+        if not file_paths:
+            return
+        # No Windows o fsync exige o arquivo aberto para escrita
+        flags = os.O_RDWR if os.name == "nt" else os.O_RDONLY
+        for file_path in file_paths:
+            try:
+                fd = os.open(file_path, flags)
+            except OSError:
+                continue
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+        if os.name != "nt":
+            # Garante as entradas de diretório (renomeações e links) dos blobs novos
+            fd = os.open(self.root, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def remove(self, file_paths):
+        """Apaga os blobs informados (ignora caminhos fora da pasta e arquivos já ausentes)."""
+        for file_path in file_paths:
+            if self.contains(file_path):
+                self._remove_file(file_path)
+
+    @staticmethod
+    def _remove_file(file_path):
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
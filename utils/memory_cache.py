@@ -0,0 +1,68 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class MemoryCache(ABC):
+    """Cache LRU em memória com limite em bytes.
+
+    Subclasses informam quanto cada valor ocupa (`value_bytes`) e podem mudar a
+    ordem de descarte (`eviction_order`; por padrão, do menos ao mais usado).
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # chave -> (valor, bytes), do menos ao mais usado
+        self._total_bytes = 0
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def get(self, key):
+        """Retorna o valor da chave (ou None) e a marca como recém-usada."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value):
+        self.remove(key)
+        size = self.value_bytes(value)
+        self._entries[key] = (value, size)
+        self._total_bytes += size
+        self._evict()
+
+    def remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+
+    def clear(self):
+        self._entries.clear()
+        self._total_bytes = 0
+
+    @abstractmethod
+    def value_bytes(self, value):
+        """Bytes que `value` ocupa na memória."""
+
+    def eviction_order(self):
+        """Chaves na ordem em que podem ser descartadas (as omitidas ficam)."""
+        return list(self._entries)
+
+    def _evict(self):
+        if self._total_bytes <= self.max_bytes:
+            return
+        # A entrada mais recente fica mesmo que sozinha passe do limite
+        newest = next(reversed(self._entries))
+        for key in self.eviction_order():
+            if self._total_bytes <= self.max_bytes:
+                break
+            if key != newest:
+                self.remove(key)
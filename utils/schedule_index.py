@@ -0,0 +1,191 @@
+import time
+from bisect import bisect_left, bisect_right, insort
+from utils.database import SCHEDULE_OPEN_START, SCHEDULE_OPEN_END
+
+
+class _IntervalNode:
+    """Nó de uma árvore de intervalos centrada."""
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, center, by_start, by_end, left, right):
+        self.center = center
+        self.by_start = by_start  # intervalos que cruzam o centro, início crescente
+        self.by_end = by_end      # os mesmos intervalos, fim decrescente
+        self.left = left
+        self.right = right
+
+
+def _build_tree(items):
+    """Monta a árvore a partir de tuplas (start, end, id, media)."""
+    if not items:
+        return None
+
+    # O centro é a mediana dos inícios: o intervalo dono dessa mediana sempre
+    # cruza o centro, então cada nó consome pelo menos um item.
+    starts = sorted(item[0] for item in items)
+    center = starts[len(starts) // 2]
+
+    left_items, right_items, middle = [], [], []
+    for item in items:
+        if item[1] <= center:
+            left_items.append(item)
+        elif item[0] > center:
+            right_items.append(item)
+        else:
+            middle.append(item)
+
+    return _IntervalNode(
+        center,
+        sorted(middle, key=lambda item: item[0]),
+        sorted(middle, key=lambda item: item[1], reverse=True),
+        _build_tree(left_items),
+        _build_tree(right_items),
+    )
+
+
+class ScheduleIndex:
+    """Índice em memória dos períodos de agendamento das mídias.
+
+    Cada mídia ocupa o intervalo [início, fim) em epoch. O índice responde quais
+    mídias estão ativas num instante em O(log n + k) e qual é o próximo instante
+    em que o conjunto ativo muda (O(log n)). As mídias saem na ordem dos ids.
+
+    `apply()` atualiza o índice sem reconstruí-lo: as fronteiras são mantidas
+    ordenadas com insort, e as mídias alteradas ficam fora da árvore (as versões
+    antigas são ignoradas nas consultas) até o acúmulo passar de uma fração do
+    tamanho, quando a árvore é refeita uma vez.
+    """
+
+    # Alterações fora da árvore toleradas antes de refazê-la (no mínimo)
+    MIN_PENDING_CHANGES = 1024
+
+    def __init__(self, entries=()):
+        """`entries` é um iterável de (start_ts, end_ts, media)."""
+        self._medias = {}           # id -> media (inclusive as de período vazio)
+        self._items = {}            # id -> (start, end, id, media), só períodos não vazios
+        self._boundary_counts = {}  # fronteira -> quantas mídias a usam
+        self._boundaries = []
+        self._stale_ids = set()   # ids cuja versão na árvore foi alterada ou removida
+        self._loose_items = {}    # id -> item ainda fora da árvore
+        for start_ts, end_ts, media in entries:
+            self._add(start_ts, end_ts, media)
+        self._rebuild_tree()
+
+    @classmethod
+    def from_records(cls, medias):
+        """Constrói o índice a partir de MediaRecords."""
+        return cls((media.schedule_start_ts, media.schedule_end_ts, media) for media in medias)
+
+    @classmethod
+    def from_database(cls, db_manager, now=None):
+        """Constrói o índice com uma única leitura das mídias ainda não expiradas.
+
+        As já expiradas nunca voltam a ficar ativas sozinhas; se forem
+        reagendadas, chegam ao índice pelo `apply()`. Mídias sem fim definido
+        nunca expiram, então numa biblioteca sem agendamento isso é quase a
+        tabela inteira: o custo de iniciar o player cresce com as mídias que
+        ele pode exibir. Adiar só as futuras pouparia pouco, porque as ativas
+        agora precisam ser lidas de qualquer forma para a lista de exibição.
+        """
+        return cls.from_records(db_manager.get_unexpired_medias(now))
+
+    def __len__(self):
+        return len(self._items)
+
+    def medias(self):
+        """Retorna todas as mídias indexadas, na ordem dos ids."""
+        return [self._medias[media_id] for media_id in sorted(self._medias)]
+
+    def apply(self, records=(), removed_ids=()):
+        """Insere/atualiza os MediaRecords de `records` e remove os ids de `removed_ids`."""
+        for media_id in removed_ids:
+            self._discard(media_id)
+        for media in records:
+            self._discard(media.id)
+            self._add(media.schedule_start_ts, media.schedule_end_ts, media)
+        if len(self._stale_ids) + len(self._loose_items) > max(self.MIN_PENDING_CHANGES, len(self._items) // 8):
+            self._rebuild_tree()
+
+    def _add(self, start_ts, end_ts, media):
+        self._medias[media.id] = media
+        if start_ts >= end_ts:
+            return  # período vazio: nunca fica ativa
+        item = (start_ts, end_ts, media.id, media)
+        self._items[media.id] = item
+        self._loose_items[media.id] = item
+        for boundary in self._item_boundaries(item):
+            count = self._boundary_counts.get(boundary, 0)
+            if count == 0:
+                insort(self._boundaries, boundary)
+            self._boundary_counts[boundary] = count + 1
+
+    def _discard(self, media_id):
+        self._medias.pop(media_id, None)
+        item = self._items.pop(media_id, None)
+        if item is None:
+            return
+        if self._loose_items.pop(media_id, None) is None:
+            # Estava na árvore: a versão dela passa a ser ignorada
+            self._stale_ids.add(media_id)
+        for boundary in self._item_boundaries(item):
+            count = self._boundary_counts[boundary] - 1
+            if count:
+                self._boundary_counts[boundary] = count
+            else:
+                del self._boundary_counts[boundary]
+                del self._boundaries[bisect_left(self._boundaries, boundary)]
+
+    @staticmethod
+    def _item_boundaries(item):
+        boundaries = []
+        if item[0] != SCHEDULE_OPEN_START:
+            boundaries.append(item[0])
+        if item[1] != SCHEDULE_OPEN_END:
+            boundaries.append(item[1])
+        return boundaries
+
+    def _rebuild_tree(self):
+        self._root = _build_tree(list(self._items.values()))
+        self._stale_ids = set()
+        self._loose_items = {}
+
+    def active_at(self, timestamp=None):
+        """Retorna as mídias ativas em `timestamp` (padrão: agora), na ordem dos ids."""
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        found = []
+        node = self._root
+        while node is not None:
+            if timestamp < node.center:
+                # Todos cruzam o centro (fim > centro > timestamp); basta checar o início.
+                for item in node.by_start:
+                    if item[0] > timestamp:
+                        break
+                    found.append(item)
+                node = node.left
+            else:
+                # Todos começam antes do centro; basta checar o fim.
+                for item in node.by_end:
+                    if item[1] <= timestamp:
+                        break
+                    found.append(item)
+                node = node.right if timestamp > node.center else None
+
+        if self._stale_ids:
+            found = [item for item in found if item[2] not in self._stale_ids]
+        found.extend(item for item in self._loose_items.values() if item[0] <= timestamp < item[1])
+        found.sort(key=lambda item: item[2])
+        return [item[3] for item in found]
+
+    def next_boundary(self, timestamp=None):
+        """Retorna o próximo instante (> timestamp) em que alguma mídia entra ou sai.
+
+        Retorna None quando não há mais mudanças agendadas.
+        """
+        if timestamp is None:
+            timestamp = int(time.time())
+        position = bisect_right(self._boundaries, timestamp)
+        if position < len(self._boundaries):
+            return self._boundaries[position]
+        return None
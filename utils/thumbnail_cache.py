@@ -0,0 +1,159 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from utils.path_helper import get_data_path
+
+# Limite padrão do cache em disco (miniaturas de 150x100 em PNG têm poucos KB)
+DEFAULT_THUMBNAIL_CACHE_BYTES = 256 * 1024 * 1024
+
+
+class ThumbnailCache:
+    """Cache em disco de miniaturas, com chave (caminho, tamanho, mtime, dimensões).
+
+    O nome de cada arquivo é `<hash do caminho>_<variante>_<hash da assinatura>`:
+    se a mídia mudar (tamanho ou mtime), a assinatura muda e a entrada antiga é
+    substituída. O total em disco é limitado, descartando as menos usadas (LRU).
+    Pode ser usado de várias threads.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_THUMBNAIL_CACHE_BYTES):
+        self.cache_dir = cache_dir or get_data_path("thumbnails")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # nome do arquivo -> bytes, do menos ao mais usado
+        self._total_bytes = 0
+        # hash do caminho -> {variante: nome da entrada atual}; acha a versão
+        # antiga de uma miniatura sem percorrer o cache
+        self._current = {}
+        self._load_entries()
+
+    def _load_entries(self):
+        """Reconstrói a ordem LRU a partir do mtime dos arquivos (atualizado a cada acesso)."""
+        found = []
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if entry.name.endswith(".tmp"):
+                    os.remove(entry.path)
+                    continue
+                stat = entry.stat()
+                found.append((stat.st_mtime_ns, entry.name, stat.st_size))
+        for _mtime, name, size in sorted(found):
+            self._entries[name] = size
+            self._total_bytes += size
+        with self._lock:
+            for name in list(self._entries):
+                # Em ordem de mtime: uma versão mais nova da mesma variante substitui a anterior
+                self._set_current(name)
+            self._evict()
+
+    @staticmethod
+    def _split_name(name):
+        """(hash do caminho, variante) de um nome de entrada."""
+        parts = name.split("_", 2)
+        if len(parts) < 3:
+            return name, ""  # arquivo com nome fora do padrão: entrada própria
+        return parts[0], parts[1]
+
+    def _set_current(self, name):
+        path_hash, variant = self._split_name(name)
+        variants = self._current.setdefault(path_hash, {})
+        stale = variants.get(variant)
+        variants[variant] = name
+        if stale is not None and stale != name:
+            self._remove(stale)
+
+    @staticmethod
+    def _path_hash(file_path):
+        return hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()
+
+    def _entry_name(self, file_path, width, height, variant, extension):
+        """Nome do arquivo em cache, ou None se a mídia não existir."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        signature = f"{stat.st_size}:{stat.st_mtime_ns}:{width}x{height}"
+        signature_hash = hashlib.sha1(signature.encode("utf-8")).hexdigest()[:16]
+        return f"{self._path_hash(file_path)}_{variant}_{signature_hash}.{extension}"
+
+    def get(self, file_path, width, height, variant="thumb", extension="png"):
+        """Retorna o caminho da miniatura em cache, ou None se não houver uma válida."""
+        name = self._entry_name(file_path, width, height, variant, extension)
+        if name is None:
+            return None
+        with self._lock:
+            if name not in self._entries:
+                return None
+            self._entries.move_to_end(name)
+        cached_path = os.path.join(self.cache_dir, name)
+        try:
+            os.utime(cached_path)
+        except OSError:
+            with self._lock:
+                self._forget(name)
+            return None
+        return cached_path
+
+    def put(self, file_path, width, height, data, variant="thumb", extension="png"):
+        """Grava os bytes da miniatura e retorna o caminho em cache (None se a mídia sumiu)."""
+        name = self._entry_name(file_path, width, height, variant, extension)
+        if name is None:
+            return None
+
+        cached_path = os.path.join(self.cache_dir, name)
+        temp_path = f"{cached_path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as cache_file:
+            cache_file.write(data)
+        os.replace(temp_path, cached_path)
+
+        with self._lock:
+            self._forget(name)
+            # A versão antiga da mesma mídia/variante ficou inválida
+            self._set_current(name)
+            self._entries[name] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+        return cached_path
+
+    def invalidate(self, file_path):
+        """Remove todas as miniaturas em cache de uma mídia."""
+        with self._lock:
+            for name in list(self._current.get(self._path_hash(file_path), {}).values()):
+                self._remove(name)
+
+    def clear(self):
+        with self._lock:
+            for name in list(self._entries):
+                self._remove(name)
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def _forget(self, name):
+        size = self._entries.pop(name, None)
+        if size is not None:
+            self._total_bytes -= size
+        path_hash, variant = self._split_name(name)
+        variants = self._current.get(path_hash)
+        if variants is not None and variants.get(variant) == name:
+            del variants[variant]
+            if not variants:
+                del self._current[path_hash]
+
+    def _remove(self, name):
+        self._forget(name)
+        try:
+            os.remove(os.path.join(self.cache_dir, name))
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
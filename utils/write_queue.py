@@ -0,0 +1,164 @@
+import atexit
+import threading
+import time
+
+# Espera antes de tentar de novo um lote que falhou; dobra a cada falha seguida
+WRITE_RETRY_DELAY = 0.5
+MAX_WRITE_RETRY_DELAY = 8.0
+# Tentativas de um lote antes de descartá-lo
+MAX_WRITE_ATTEMPTS = 5
+# Espera máxima padrão (s) do flush, contando as novas tentativas
+FLUSH_TIMEOUT = 10.0
+
+
+class MediaWriteQueue:
+    """Fila de escrita atrasada (write-behind) para agendamento e duração das mídias.
+
+    As chamadas só registram a alteração em memória e retornam na hora. Uma thread
+    dedicada junta as alterações por media_id (a última vence) e grava tudo numa
+    transação por lote. `close()` (também chamado no encerramento do processo)
+    garante que nada pendente se perca.
+
+    Um lote que falha volta para a fila e é tentado de novo com espera crescente;
+    depois de MAX_WRITE_ATTEMPTS falhas seguidas ele é descartado (com aviso).
+    """
+
+    def __init__(self, db_manager, batch_delay=0.5):
+        self.db_manager = db_manager
+        # Espera após a primeira alteração para agrupar edições em sequência.
+        self.batch_delay = batch_delay
+
+        self._pending = {}
+        self._writing = False
+        # Numeração das alterações: o flush espera até a última que viu ser
+        # gravada (`_written_seq`) ou até um lote com ela ser descartado (`_dropped_seq`)
+        self._enqueued_seq = 0
+        self._written_seq = 0
+        self._dropped_seq = 0
+        self._failed_attempts = 0
+        self._flush_waiters = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self._thread = threading.Thread(target=self._run, name="MediaWriteQueue", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def update_media_schedule(self, media_id, start_date, start_time, end_date, end_time):
+        """Agenda a gravação do novo período da mídia."""
+        self._enqueue(media_id, "schedule", (start_date, start_time, end_date, end_time))
+
+    def update_media_duration(self, media_id, duration_seconds):
+        """Agenda a gravação da nova duração da mídia."""
+        self._enqueue(media_id, "duration", duration_seconds)
+
+    def discard(self, media_ids):
+        """Descarta alterações pendentes de mídias que foram removidas."""
+        with self._condition:
+            for media_id in media_ids:
+                self._pending.pop(media_id, None)
+
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        """Bloqueia até que as alterações enfileiradas até agora estejam gravadas.
+
+        Espera também pelas novas tentativas de lotes que falharam. Retorna True
+        se tudo foi gravado, ou False se um lote foi descartado ou se `timeout`
+        segundos passaram antes disso (as tentativas continuam em segundo plano).
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            target_seq = self._enqueued_seq
+            self._flush_waiters += 1
+            self._condition.notify_all()
+            try:
+                while (self._written_seq < target_seq and self._dropped_seq < target_seq
+                       and (self._pending or self._writing) and self._thread.is_alive()):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+                if self._written_seq >= target_seq:
+                    return True
+                # Sem nada pendente e sem descarte: o que faltava foi descartado por discard()
+                return self._dropped_seq < target_seq and not self._pending and not self._writing
+            finally:
+                self._flush_waiters -= 1
+
+    def close(self):
+        """Grava o que estiver pendente e encerra a thread de escrita."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def _enqueue(self, media_id, field, value):
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("MediaWriteQueue já foi encerrada.")
+            self._pending.setdefault(media_id, {})[field] = value
+            self._enqueued_seq += 1
+            self._condition.notify_all()
+
+    def _run(self):
+        try:
+            while True:
+                with self._condition:
+                    while not self._pending and not self._closed:
+                        self._condition.wait()
+                    if not self._pending and self._closed:
+                        return
+
+                    # Dá tempo para novas edições entrarem no mesmo lote, a menos
+                    # que alguém esteja esperando o flush ou a fila esteja fechando.
+                    deadline = time.monotonic() + self.batch_delay
+                    remaining = self.batch_delay
+                    while remaining > 0 and not self._closed and not self._flush_waiters:
+                        self._condition.wait(remaining)
+                        remaining = deadline - time.monotonic()
+
+                    batch, self._pending = self._pending, {}
+                    batch_seq = self._enqueued_seq
+                    self._writing = True
+
+                try:
+                    self.db_manager.apply_media_updates(batch)
+                except Exception as e:
+                    with self._condition:
+                        self._failed_attempts += 1
+                        if self._closed or self._failed_attempts >= MAX_WRITE_ATTEMPTS:
+                            self._dropped_seq = batch_seq
+                            print(f"Erro ao gravar alterações de mídias; {len(batch)} mídia(s) "
+                                  f"descartada(s) após {self._failed_attempts} tentativa(s): {e}")
+                            self._failed_attempts = 0
+                            if self._closed:
+                                self._pending.clear()
+                        else:
+                            print(f"Erro ao gravar alterações de mídias (tentativa {self._failed_attempts}): {e}")
+                            # Devolve o lote sem sobrescrever edições mais novas.
+                            for media_id, fields in batch.items():
+                                merged = dict(fields)
+                                merged.update(self._pending.get(media_id, {}))
+                                self._pending[media_id] = merged
+                            retry_delay = min(WRITE_RETRY_DELAY * 2 ** (self._failed_attempts - 1),
+                                              MAX_WRITE_RETRY_DELAY)
+                            self._writing = False
+                            self._condition.notify_all()
+                            # Espera antes de tentar de novo (nem o flush encurta essa espera)
+                            deadline = time.monotonic() + retry_delay
+                            while not self._closed and time.monotonic() < deadline:
+                                self._condition.wait(deadline - time.monotonic())
+                else:
+                    with self._condition:
+                        self._written_seq = batch_seq
+                        self._failed_attempts = 0
+                finally:
+                    with self._condition:
+                        self._writing = False
+                        self._condition.notify_all()
+        finally:
+            self.db_manager.close_thread_connection()
+            with self._condition:
+                self._condition.notify_all()